@@ -34,6 +34,9 @@ Options:
     --no-lite           Use full role definitions (more detailed)
     --branch-prefix     Prefix for task branches (default: task)
     --max-iterations    Maximum iterations before stopping (default: 50)
+    --commit-batch-size Commit once every N iterations (default: 1)
+    --skip-cached       Skip commander/generator if their output is up to date
+    --no-prewarm        Start the codex worker lazily instead of at startup
     -h, --help          Show this help message
 
 Examples:
@@ -56,13 +59,20 @@ Examples:
     python Orchestrator.py -i -d ./myproject -R "Build API" -b
 """
 import argparse
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
 import re
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 # Add tools to path
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -81,6 +91,52 @@ from tools.codex import set_log_dir
 # Console Output Helpers
 # ============================================================================
 
+def _write_stdout(data: bytes):
+    """Write pre-encoded bytes to stdout's binary buffer (text fallback)."""
+    out = sys.stdout
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:
+        out.write(data.decode(getattr(out, "encoding", None) or "utf-8", "replace"))
+    else:
+        buffer.write(data)
+
+
+def _encode_stdout(text: str) -> bytes:
+    return text.encode(getattr(sys.stdout, "encoding", None) or "utf-8", "replace")
+
+
+class _StdoutHandler(logging.Handler):
+    """
+    Write records to the current sys.stdout without flushing per record.
+    
+    The record's `prefix` extra is the pre-encoded colored tag, so only
+    the message itself is encoded per line. Console flushes explicitly at
+    phase/banner boundaries, after warnings/errors (which often precede a
+    wait, e.g. the retry sleep) and before handing control to codex or the user.
+    """
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            _write_stdout(record.prefix + _encode_stdout(record.getMessage()) + b"\n")
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        sys.stdout.flush()
+
+
+def _make_console_logger() -> logging.Logger:
+    logger = logging.getLogger("ace.console")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers.clear()
+    logger.addHandler(_StdoutHandler())
+    return logger
+
+
+_console_logger = _make_console_logger()
+
+
 class Console:
     """Minimal colored console output for progress visibility."""
     
@@ -93,59 +149,89 @@ class Console:
     CYAN = "\033[96m"
     GRAY = "\033[90m"
     
+    # Pre-encoded line prefixes (color + tag + reset + space)
+    INFO_PREFIX = b"\033[94m[INFO]\033[0m "
+    STEP_PREFIX = b"\033[96m\033[1m[STEP]\033[0m "
+    OK_PREFIX = b"\033[92m\033[1m[OK]\033[0m "
+    WARN_PREFIX = b"\033[93m[WARN]\033[0m "
+    ERROR_PREFIX = b"\033[91m\033[1m[ERROR]\033[0m "
+    FATAL_PREFIX = b"\033[91m\033[1m[FATAL]\033[0m "
+    
     @classmethod
-    def _print(cls, prefix: str, color: str, msg: str):
-        print(f"{color}{prefix}{cls.RESET} {msg}", flush=True)
+    def _print(cls, prefix: bytes, msg: str):
+        _console_logger.info(msg, extra={"prefix": prefix})
+    
+    @classmethod
+    def _write_block(cls, text: str):
+        _write_stdout(_encode_stdout(text))
+        cls.flush()
+    
+    @classmethod
+    def flush(cls):
+        """Flush buffered console output (phase boundaries, before blocking)."""
+        for handler in _console_logger.handlers:
+            handler.flush()
     
     @classmethod
     def info(cls, msg: str):
-        cls._print("[INFO]", cls.BLUE, msg)
+        cls._print(cls.INFO_PREFIX, msg)
     
     @classmethod
     def step(cls, msg: str):
-        cls._print("[STEP]", cls.CYAN + cls.BOLD, msg)
+        cls._print(cls.STEP_PREFIX, msg)
     
     @classmethod
     def success(cls, msg: str):
-        cls._print("[OK]", cls.GREEN + cls.BOLD, msg)
+        cls._print(cls.OK_PREFIX, msg)
     
     @classmethod
     def warn(cls, msg: str):
-        cls._print("[WARN]", cls.YELLOW, msg)
+        cls._print(cls.WARN_PREFIX, msg)
+        cls.flush()
     
     @classmethod
     def error(cls, msg: str):
-        cls._print("[ERROR]", cls.RED + cls.BOLD, msg)
+        cls._print(cls.ERROR_PREFIX, msg)
+        cls.flush()
     
     @classmethod
     def fatal(cls, msg: str):
-        cls._print("[FATAL]", cls.RED + cls.BOLD, msg)
+        cls._print(cls.FATAL_PREFIX, msg)
+        cls.flush()
         sys.exit(1)
     
     @classmethod
     def banner(cls, title: str):
         line = "=" * 60
-        print(f"\n{cls.CYAN}{line}{cls.RESET}")
-        print(f"{cls.CYAN}{cls.BOLD}  {title}{cls.RESET}")
-        print(f"{cls.CYAN}{line}{cls.RESET}\n", flush=True)
+        cls._write_block(
+            f"\n{cls.CYAN}{line}{cls.RESET}\n"
+            f"{cls.CYAN}{cls.BOLD}  {title}{cls.RESET}\n"
+            f"{cls.CYAN}{line}{cls.RESET}\n\n"
+        )
     
     @classmethod
     def phase(cls, name: str, role: str):
-        print(f"\n{cls.YELLOW}{'─' * 50}{cls.RESET}")
-        print(f"{cls.YELLOW}{cls.BOLD}▶ {name}{cls.RESET} {cls.GRAY}[role: {role}]{cls.RESET}")
-        print(f"{cls.YELLOW}{'─' * 50}{cls.RESET}\n", flush=True)
+        cls._write_block(
+            f"\n{cls.YELLOW}{'─' * 50}{cls.RESET}\n"
+            f"{cls.YELLOW}{cls.BOLD}▶ {name}{cls.RESET} {cls.GRAY}[role: {role}]{cls.RESET}\n"
+            f"{cls.YELLOW}{'─' * 50}{cls.RESET}\n\n"
+        )
     
     @classmethod
     def done(cls):
-        print(f"\n{cls.GREEN}{'═' * 60}{cls.RESET}")
-        print(f"{cls.GREEN}{cls.BOLD}  ✓ ALL TASKS COMPLETED - PROJECT RELEASED{cls.RESET}")
-        print(f"{cls.GREEN}{'═' * 60}{cls.RESET}\n", flush=True)
+        cls._write_block(
+            f"\n{cls.GREEN}{'═' * 60}{cls.RESET}\n"
+            f"{cls.GREEN}{cls.BOLD}  ✓ ALL TASKS COMPLETED - PROJECT RELEASED{cls.RESET}\n"
+            f"{cls.GREEN}{'═' * 60}{cls.RESET}\n\n"
+        )
     
     @classmethod
     def aborted(cls):
-        print(f"\n{cls.RED}{'═' * 60}{cls.RESET}")
-        print(f"{cls.RED}{cls.BOLD}  ✗ PROJECT ABORTED - TERMINATED BY AUDITOR{cls.RESET}")
-        print(f"{cls.RED}{'═' * 60}{cls.RESET}\n", flush=True)
+        cls._write_block(
+            f"\n{cls.RED}{'═' * 60}{cls.RESET}\n"
+            f"{cls.RED}{cls.BOLD}  ✗ PROJECT ABORTED - TERMINATED BY AUDITOR{cls.RESET}\n"
+            f"{cls.RED}{'═' * 60}{cls.RESET}\n\n"
+        )
 
 
 # ============================================================================
@@ -159,16 +245,118 @@ RETRY_DELAY_SECONDS = 5
 def format_duration(seconds: float) -> str:
     """Format duration in human-readable form."""
     if seconds < 60:
-        return f"{seconds:.1f}s"
-    elif seconds < 3600:
-        minutes = int(seconds // 60)
-        secs = seconds % 60
-        return f"{minutes}m {secs:.1f}s"
-    else:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours}h {minutes}m {secs:.0f}s"
+        return "%.1fs" % seconds
+    minutes, secs = divmod(seconds, 60)
+    if minutes < 60:
+        return "%dm %.1fs" % (minutes, secs)
+    hours, minutes = divmod(int(minutes), 60)
+    return "%dh %dm %.0fs" % (hours, minutes, secs)
+
+
+CODEX_SCRIPT = SCRIPT_DIR / "tools" / "codex.py"
+DAEMON_END_MARKER = "<<<END>>>"
+_SESSION_ID_RE = re.compile(r'SESSION_ID:\s*(\S+)')
+
+
+class CodexWorker:
+    """
+    Long-lived `codex.py --daemon` process reused across phases.
+    
+    Requests are one JSON line on stdin; each response is one JSON line
+    followed by DAEMON_END_MARKER. A reader thread feeds stdout lines into
+    a queue so waits can honor a timeout on every platform.
+    """
+    
+    def __init__(self):
+        self.process: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+    
+    def _start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", str(CODEX_SCRIPT), "--daemon"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None,  # stderr goes directly to console (real-time)
+            text=True,
+            encoding="utf-8",
+            # No cwd and no fd sweep (our fds are non-inheritable, PEP 446)
+            # so the worker is started via posix_spawn where available.
+            # codex.py locates its files from __file__ and gets usr_cwd
+            # as an absolute path in every request.
+            close_fds=False
+        )
+        self._lines = queue.Queue()
+        reader = threading.Thread(
+            target=self._pump, args=(self.process.stdout, self._lines), daemon=True
+        )
+        reader.start()
+    
+    @staticmethod
+    def _pump(stream, lines: queue.Queue):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)  # EOF
+    
+    def start(self):
+        """Launch the worker if it is not already running (pre-warm)."""
+        if self.process is None or self.process.poll() is not None:
+            self._start()
+    
+    def request(self, payload: dict, timeout: float) -> dict:
+        """Send one request and wait for its framed response."""
+        self.start()
+        
+        self.process.stdin.write(json.dumps(payload) + "\n")
+        self.process.stdin.flush()
+        
+        deadline = time.monotonic() + timeout
+        response = None
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(cmd="codex.py --daemon", timeout=timeout)
+            if line is None:
+                self.stop(force=True)
+                raise RuntimeError("codex worker exited unexpectedly")
+            line = line.rstrip("\n")
+            if line == DAEMON_END_MARKER:
+                break
+            response = json.loads(line)
+        
+        if response is None:
+            raise RuntimeError("codex worker sent an empty response")
+        return response
+    
+    def stop(self, force: bool = False):
+        """
+        Shut the worker down: ask politely, then close stdin and wait.
+        force=True kills it right away (timeouts, protocol errors).
+        """
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if force:
+            process.kill()
+        else:
+            try:
+                process.stdin.write(json.dumps({"cmd": "shutdown"}) + "\n")
+                process.stdin.flush()
+            except Exception:
+                pass
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+_codex_worker = CodexWorker()
+atexit.register(_codex_worker.stop)
 
 
 def invoke_codex(
@@ -183,6 +371,9 @@ def invoke_codex(
     """
     Invoke codex.py with a specific role and task, with automatic retry on failure.
     
+    Requests go to the shared `codex.py --daemon` worker, so the interpreter
+    starts once per run instead of once per phase.
+    
     Args:
         role: Role name (auditor, commander, generator, reflector)
         lite: If True, use lite role definitions (e.g., auditor_lite instead of auditor)
@@ -193,20 +384,15 @@ def invoke_codex(
     Raises:
         RuntimeError on codex failure after all retries exhausted
     """
-    codex_script = SCRIPT_DIR / "tools" / "codex.py"
-    
     # Use lite role if specified
     actual_role = f"{role}_lite" if lite else role
     
-    cmd = [
-        sys.executable,
-        str(codex_script),
-        "--role", actual_role,
-        "--usr-cwd", str(usr_cwd),
-    ]
-    if yolo:
-        cmd.append("--yolo")
-    cmd.append(task)
+    payload = {
+        "role": actual_role,
+        "usr_cwd": str(usr_cwd),
+        "task": task,
+        "yolo": yolo,
+    }
     
     Console.info(f"Running codex: role={actual_role}")
     Console.info(f"Task: {task[:80]}{'...' if len(task) > 80 else ''}")
@@ -219,40 +405,37 @@ def invoke_codex(
                 Console.warn(f"Retry attempt {attempt}/{max_retries}...")
                 time.sleep(RETRY_DELAY_SECONDS)
             
-            # Use Popen to stream stderr in real-time while capturing stdout
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=None,  # stderr goes directly to console (real-time)
-                text=True,
-                cwd=str(SCRIPT_DIR)
-            )
+            Console.flush()  # keep our lines ahead of the worker's stderr
+            response = _codex_worker.request(payload, timeout)
             
-            stdout, _ = process.communicate(timeout=timeout)
-            
-            if process.returncode != 0:
-                last_error = RuntimeError(f"codex exited with code {process.returncode}")
-                Console.error(f"Codex failed (exit {process.returncode})")
+            status = response.get("status", 1)
+            if status != 0:
+                last_error = RuntimeError(f"codex exited with code {status}")
+                Console.error(f"Codex failed (exit {status})")
                 continue  # Retry
             
-            output = stdout.strip()
+            output = response.get("output", "").strip()
             
-            # Extract SESSION_ID from output
-            session_id = None
-            match = re.search(r'SESSION_ID:\s*(\S+)', output)
-            if match:
-                session_id = match.group(1)
+            # The worker reports SESSION_ID as a field; scan the text only as a fallback
+            session_id = response.get("session_id")
+            if not session_id:
+                match = _SESSION_ID_RE.search(output)
+                if match:
+                    session_id = match.group(1)
+            if session_id:
                 Console.info(f"Captured SESSION_ID: {session_id}")
             
             return output, session_id
             
         except subprocess.TimeoutExpired:
-            process.kill()
+            _codex_worker.stop(force=True)
             last_error = RuntimeError(f"codex timed out after {timeout}s")
             Console.error(f"Codex timeout ({timeout}s)")
             continue  # Retry
         
         except Exception as e:
+            # Protocol or pipe failure: restart the worker on the next attempt
+            _codex_worker.stop(force=True)
             last_error = RuntimeError(f"codex error: {e}")
             Console.error(f"Codex error: {e}")
             continue  # Retry
@@ -266,18 +449,146 @@ def invoke_codex(
 # File Helpers
 # ============================================================================
 
+TASK_ID_FILE = "current_task_id.txt"
+FEEDBACK_FILE = "user_feedback.txt"
+FEEDBACK_CONSUMED_FILE = "user_feedback.consumed"
+
+
+def context_root(usr_cwd: Path) -> str:
+    """Return the project's context directory as a plain path string."""
+    return os.path.join(usr_cwd, "context")
+
+
+class _TaskIdCache:
+    """
+    Stat-validated cache of current_task_id.txt contents.
+    
+    The file only changes when the auditor rewrites it, so a matching
+    (st_mtime_ns, st_size) pair lets us skip the open + read.
+    """
+    
+    def __init__(self):
+        self._entries = {}
+    
+    def clear(self):
+        """Drop cached contents (call after a phase that may rewrite the file)."""
+        self._entries.clear()
+    
+    def read(self, task_file: str) -> Optional[str]:
+        key = task_file
+        cached = self._entries.get(key)
+        if cached is not None:
+            try:
+                st = os.stat(key)
+            except FileNotFoundError:
+                del self._entries[key]
+                return None
+            if cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+        
+        # Miss: one open + fstat + read, no separate path stat
+        try:
+            fd = os.open(key, os.O_RDONLY)
+        except FileNotFoundError:
+            self._entries.pop(key, None)
+            return None
+        try:
+            st = os.fstat(fd)
+            data = os.read(fd, max(st.st_size, 256))
+        finally:
+            os.close(fd)
+        
+        content = data.decode("utf-8").strip()
+        self._entries[key] = (st.st_mtime_ns, st.st_size, content)
+        return content
+
+
+_task_id_cache = _TaskIdCache()
+
+
 def read_task_id(usr_cwd: Path) -> Optional[str]:
     """Read current_task_id.txt and return its content."""
-    task_file = usr_cwd / "context" / "current_task_id.txt"
-    if not task_file.exists():
-        return None
-    content = task_file.read_text(encoding="utf-8").strip()
+    content = _task_id_cache.read(os.path.join(context_root(usr_cwd), TASK_ID_FILE))
     return content if content else None
 
 
-def file_exists(usr_cwd: Path, relative_path: str) -> bool:
-    """Check if a file exists under usr_cwd."""
-    return (usr_cwd / relative_path).exists()
+def file_ready(usr_cwd: Path, relative_path: str) -> bool:
+    """Check that a phase artifact exists and is non-empty (single stat)."""
+    try:
+        return os.stat(os.path.join(usr_cwd, relative_path)).st_size > 0
+    except OSError:
+        return False
+
+
+PHASE_CACHE_FILE = "context/.ace_cache.json"
+
+# Context files each cacheable phase reads, relative to context/
+PHASE_INPUTS = {
+    "commander": ("System_State_Snapshot.md", "Project_Roadmap.md"),
+    "generator": ("AI_Task_Brief_{task_id}.md",),
+}
+
+
+def phase_inputs_digest(usr_cwd: Path, role: str, task_id: str) -> str:
+    """
+    Hash task_id plus the contents of the role's input files.
+    
+    Missing inputs hash differently from empty ones, so a file appearing
+    or disappearing also invalidates the cache.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(task_id.encode("utf-8"))
+    root = context_root(usr_cwd)
+    for name in PHASE_INPUTS.get(role, ()):
+        name = name.format(task_id=task_id)
+        h.update(b"\0" + name.encode("utf-8") + b"\0")
+        try:
+            with open(os.path.join(root, name), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"\1missing")
+    return h.hexdigest()
+
+
+def _load_phase_cache(usr_cwd: Path) -> dict:
+    try:
+        with open(os.path.join(usr_cwd, PHASE_CACHE_FILE), encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def record_phase_session(usr_cwd: Path, role: str, task_id: str, session_id: str, digest: Optional[str] = None):
+    """Remember the session that produced a phase artifact (for --skip-cached)."""
+    cache = _load_phase_cache(usr_cwd)
+    cache[f"{role}:{task_id}"] = {"session_id": session_id, "digest": digest}
+    try:
+        with open(os.path.join(usr_cwd, PHASE_CACHE_FILE), "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        Console.warn(f"Failed to update {PHASE_CACHE_FILE}: {e}")
+
+
+def cached_phase_session(usr_cwd: Path, role: str, task_id: str, artifact: str, digest: Optional[str] = None) -> Optional[str]:
+    """
+    Return the recorded session id when `artifact` is newer than
+    current_task_id.txt (i.e. produced after the latest task assignment)
+    and, if `digest` is given, the phase inputs are unchanged since then.
+    """
+    try:
+        artifact_st = os.stat(os.path.join(usr_cwd, artifact))
+        task_mtime = os.stat(os.path.join(context_root(usr_cwd), TASK_ID_FILE)).st_mtime_ns
+    except OSError:
+        return None
+    if artifact_st.st_size == 0 or artifact_st.st_mtime_ns <= task_mtime:
+        return None
+    entry = _load_phase_cache(usr_cwd).get(f"{role}:{task_id}")
+    if not isinstance(entry, dict):
+        return None
+    if digest is not None and entry.get("digest") != digest:
+        return None
+    return entry.get("session_id")
 
 
 # ============================================================================
@@ -317,6 +628,7 @@ def phase_init(usr_cwd: Path, requirement: Optional[str], branch_prefix: str, re
         )
     
     output, session_id = invoke_codex("auditor", usr_cwd, init_task, yolo=yolo, lite=lite)
+    _task_id_cache.clear()  # the auditor owns current_task_id.txt
     
     if not session_id:
         Console.warn("No SESSION_ID captured from auditor init")
@@ -343,16 +655,28 @@ def phase_init(usr_cwd: Path, requirement: Optional[str], branch_prefix: str, re
     return task_id, actual_branch, session_id
 
 
-def phase_commander(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False) -> str:
+def phase_commander(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False, skip_cached: bool = False) -> str:
     """
     Commander phase: generate AI_Task_Brief_<task_id>.md
     
+    If skip_cached=True, the brief is newer than current_task_id.txt and
+    the Snapshot/Roadmap hash matches the recorded run, codex is not
+    invoked and the recorded session id is returned.
+    
     Returns:
         commander_session_id
     """
     role_suffix = "_lite" if lite else ""
     Console.phase(f"COMMANDER for Task: {task_id}", f"commander{role_suffix}")
     
+    brief_path = f"context/AI_Task_Brief_{task_id}.md"
+    if skip_cached:
+        digest = phase_inputs_digest(usr_cwd, "commander", task_id)
+        cached_sid = cached_phase_session(usr_cwd, "commander", task_id, brief_path, digest)
+        if cached_sid:
+            Console.success(f"Up to date, skipping codex: {brief_path}")
+            return cached_sid
+    
     task = f"task_id: {task_id}"
     output, session_id = invoke_codex("commander", usr_cwd, task, yolo=yolo, lite=lite)
     
@@ -360,16 +684,17 @@ def phase_commander(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool
         Console.warn("No SESSION_ID from commander")
         session_id = "unknown"
     
-    # Check brief file exists
-    brief_path = f"context/AI_Task_Brief_{task_id}.md"
-    if not file_exists(usr_cwd, brief_path):
+    # Check brief file exists and is non-empty
+    if not file_ready(usr_cwd, brief_path):
         Console.fatal(f"Commander failed to generate {brief_path}")
     
+    if skip_cached:
+        record_phase_session(usr_cwd, "commander", task_id, session_id, digest)
     Console.success(f"Generated: {brief_path}")
     return session_id
 
 
-def phase_generator(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False) -> str:
+def phase_generator(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False, skip_cached: bool = False) -> str:
     """
     Generator phase: execute task using Playbook and generate Execution_Log_<task_id>.md
     
@@ -378,12 +703,24 @@ def phase_generator(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool
     2. Applies best practices and avoids anti-patterns
     3. Generates code with explicit bullet references
     
+    If skip_cached=True, the execution log is newer than
+    current_task_id.txt and the brief hash matches the recorded run,
+    codex is not invoked.
+    
     Returns:
         generator_session_id
     """
     role_suffix = "_lite" if lite else ""
     Console.phase(f"GENERATOR for Task: {task_id}", f"generator{role_suffix}")
     
+    log_path = f"context/Execution_Log_{task_id}.md"
+    if skip_cached:
+        digest = phase_inputs_digest(usr_cwd, "generator", task_id)
+        cached_sid = cached_phase_session(usr_cwd, "generator", task_id, log_path, digest)
+        if cached_sid:
+            Console.success(f"Up to date, skipping codex: {log_path}")
+            return cached_sid
+    
     task = f"task_id: {task_id}"
     output, session_id = invoke_codex("generator", usr_cwd, task, yolo=yolo, lite=lite)
     
@@ -391,16 +728,17 @@ def phase_generator(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool
         Console.warn("No SESSION_ID from generator")
         session_id = "unknown"
     
-    # Check log file exists
-    log_path = f"context/Execution_Log_{task_id}.md"
-    if not file_exists(usr_cwd, log_path):
+    # Check log file exists and is non-empty
+    if not file_ready(usr_cwd, log_path):
         Console.fatal(f"Generator failed to generate {log_path}")
     
+    if skip_cached:
+        record_phase_session(usr_cwd, "generator", task_id, session_id, digest)
     Console.success(f"Generated: {log_path}")
     return session_id
 
 
-def phase_executor(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False) -> str:
+def phase_executor(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False, skip_cached: bool = False) -> str:
     """
     Executor phase: execute task and generate execution_Log_<task_id>.md
     (Legacy alias for phase_generator for backward compatibility)
@@ -408,7 +746,7 @@ def phase_executor(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool =
     Returns:
         executor_session_id
     """
-    return phase_generator(usr_cwd, task_id, yolo, lite)
+    return phase_generator(usr_cwd, task_id, yolo, lite, skip_cached)
 
 
 def phase_reflector(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool = False) -> str:
@@ -434,9 +772,9 @@ def phase_reflector(usr_cwd: Path, task_id: str, yolo: bool = False, lite: bool
         Console.warn("No SESSION_ID from reflector")
         session_id = "unknown"
     
-    # Check reflection file exists
+    # Check reflection file exists and is non-empty
     reflection_path = f"context/Reflection_{task_id}.md"
-    if not file_exists(usr_cwd, reflection_path):
+    if not file_ready(usr_cwd, reflection_path):
         Console.warn(f"Reflector did not generate {reflection_path} - continuing anyway")
     else:
         Console.success(f"Generated: {reflection_path}")
@@ -461,15 +799,26 @@ def phase_auditor_review(usr_cwd: Path, task_id: str, yolo: bool = False, lite:
     task = f"审查 task_id: {task_id}"
     
     # Only add user feedback if exists
-    feedback_file = usr_cwd / "context" / "user_feedback.txt"
-    if feedback_file.exists():
-        user_feedback = feedback_file.read_text(encoding="utf-8").strip()
-        if user_feedback:
-            task += f"\n\n**用户反馈:** {user_feedback}"
-            Console.info(f"Including user feedback: {user_feedback[:50]}...")
-        feedback_file.unlink()
+    # Claim the feedback atomically by renaming it, then drop the claimed
+    # copy so it is not committed into the project
+    context_dir = context_root(usr_cwd)
+    consumed_file = os.path.join(context_dir, FEEDBACK_CONSUMED_FILE)
+    try:
+        os.replace(os.path.join(context_dir, FEEDBACK_FILE), consumed_file)
+    except FileNotFoundError:
+        user_feedback = None
+    else:
+        try:
+            with open(consumed_file, encoding="utf-8") as f:
+                user_feedback = f.read().strip()
+        finally:
+            os.remove(consumed_file)
+    if user_feedback:
+        task += f"\n\n**用户反馈:** {user_feedback}"
+        Console.info(f"Including user feedback: {user_feedback[:50]}...")
     
     output, session_id = invoke_codex("auditor", usr_cwd, task, yolo=yolo, lite=lite)
+    _task_id_cache.clear()  # the auditor owns current_task_id.txt
     
     if not session_id:
         Console.warn("No SESSION_ID from auditor review")
@@ -479,14 +828,13 @@ def phase_auditor_review(usr_cwd: Path, task_id: str, yolo: bool = False, lite:
     return session_id
 
 
-def commit_iteration(
-    usr_cwd: Path,
+def format_commit_message(
     task_id: str,
     commander_sid: str,
     generator_sid: str,
     reflector_sid: Optional[str] = None
-) -> Optional[str]:
-    """Commit changes after commander, generator, and reflector phases."""
+) -> str:
+    """Build the per-iteration commit message (task id + session ids)."""
     commit_msg = (
         f"task: {task_id}\n"
         f"commander_session_id: {commander_sid}\n"
@@ -496,6 +844,19 @@ def commit_iteration(
     if reflector_sid:
         commit_msg += f"\nreflector_session_id: {reflector_sid}"
     
+    return commit_msg
+
+
+def commit_iteration(
+    usr_cwd: Path,
+    task_id: str,
+    commander_sid: str,
+    generator_sid: str,
+    reflector_sid: Optional[str] = None
+) -> Optional[str]:
+    """Commit changes after commander, generator, and reflector phases."""
+    commit_msg = format_commit_message(task_id, commander_sid, generator_sid, reflector_sid)
+    
     commit_hash = stage_and_commit(usr_cwd, commit_msg)
     if commit_hash:
         Console.success(f"Committed: {commit_hash[:8]}")
@@ -505,6 +866,62 @@ def commit_iteration(
     return commit_hash
 
 
+class CommitBatcher:
+    """
+    Defer iteration commits and write one commit every `batch_size` iterations.
+    
+    Each pending iteration contributes its own message block, so the batched
+    commit still records every task and session id. Call flush() when the
+    loop ends normally; on an error path call abandon() instead, since the
+    working tree may then hold a half-finished iteration.
+    """
+    
+    def __init__(self, usr_cwd: Path, batch_size: int = 1):
+        self.usr_cwd = usr_cwd
+        self.batch_size = max(1, batch_size)
+        self.pending = []
+    
+    def add(
+        self,
+        task_id: str,
+        commander_sid: str,
+        generator_sid: str,
+        reflector_sid: Optional[str] = None
+    ) -> Optional[str]:
+        """Record one iteration; commits when the batch is full."""
+        self.pending.append((task_id, commander_sid, generator_sid, reflector_sid))
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        Console.info(f"Commit deferred ({len(self.pending)}/{self.batch_size} iterations batched)")
+        return None
+    
+    def flush(self) -> Optional[str]:
+        """Commit all pending iterations in one commit."""
+        if not self.pending:
+            return None
+        
+        entries, self.pending = self.pending, []
+        if len(entries) == 1:
+            return commit_iteration(self.usr_cwd, *entries[0])
+        
+        commit_msg = "\n\n".join(format_commit_message(*entry) for entry in entries)
+        commit_hash = stage_and_commit(self.usr_cwd, commit_msg)
+        if commit_hash:
+            Console.success(f"Committed {len(entries)} iterations: {commit_hash[:8]}")
+        else:
+            Console.warn(f"Nothing to commit for {len(entries)} batched iterations")
+        return commit_hash
+    
+    def abandon(self) -> None:
+        """Drop pending iterations without committing and warn about them."""
+        if not self.pending:
+            return
+        
+        task_ids = ", ".join(entry[0] for entry in self.pending)
+        self.pending = []
+        Console.warn(f"Batched iterations not committed ({task_ids}); changes remain in the working tree")
+
+
 # ============================================================================
 # Main Orchestration Loop
 # ============================================================================
@@ -537,7 +954,10 @@ def run_orchestration(
     yolo: bool = False,
     step: bool = False,
     new_branch: bool = False,
-    lite: bool = False
+    lite: bool = False,
+    commit_batch_size: int = 1,
+    skip_cached: bool = False,
+    prewarm: bool = True
 ):
     """
     Main orchestration loop with ACE-style Generator-Reflector-Curator workflow.
@@ -551,12 +971,21 @@ def run_orchestration(
     Runs until task_id becomes 'finish' or max iterations reached.
     If step=True, pauses after each iteration for user feedback.
     If lite=True, uses simplified role definitions.
+    commit_batch_size > 1 commits once every N iterations; pending iterations
+    are committed on finish/abort/quit/max iterations, but not on errors.
+    If skip_cached=True, commander/generator reuse artifacts that are newer
+    than the current task assignment.
+    If prewarm=True, the codex worker is launched before the init phase.
     """
     Console.banner("ACE ORCHESTRATOR STARTING")
     Console.info(f"Project: {usr_cwd}")
     Console.info(f"Mode: {'RESUME' if resume else 'INIT'}")
     Console.info(f"Role Style: {'LITE' if lite else 'FULL'}")
     
+    # Boot the codex worker now so interpreter startup overlaps the setup below
+    if prewarm:
+        _codex_worker.start()
+    
     # 设置日志目录为用户项目目录
     set_log_dir(usr_cwd)
     if requirement:
@@ -569,106 +998,122 @@ def run_orchestration(
         Console.fatal(f"Git error: {e}")
     
     # Ensure context directory exists
-    context_dir = usr_cwd / "context"
-    context_dir.mkdir(exist_ok=True)
+    context_dir = context_root(usr_cwd)
+    os.makedirs(context_dir, exist_ok=True)
     
     # Init phase: Auditor initializes project and sets first task_id
     init_aud_start = time.time()
     task_id, branch, init_auditor_sid = phase_init(usr_cwd, requirement, branch_prefix, resume, yolo, new_branch, lite)
     init_aud_duration = time.time() - init_aud_start
     
-    # Main loop: A -> C -> G -> R -> user_review -> commit
-    iteration = 0
-    while iteration < max_iterations:
-        iteration += 1
-        Console.banner(f"ITERATION {iteration} - Task: {task_id}")
-        iter_start = time.time()
-        
-        # Auditor (iteration 1 uses init timing)
-        if iteration == 1:
-            aud_duration = init_aud_duration
-        else:
-            aud_start = time.time()
-            auditor_sid = phase_auditor_review(usr_cwd, task_id, yolo, lite)
-            aud_duration = time.time() - aud_start
+    batcher = CommitBatcher(usr_cwd, commit_batch_size)
+    try:
+        # Main loop: A -> C -> G -> R -> user_review -> commit
+        iteration = 0
+        while iteration < max_iterations:
+            iteration += 1
+            Console.banner(f"ITERATION {iteration} - Task: {task_id}")
+            iter_start = time.time()
             
-            # Check for stop signals after auditor
-            new_task_id = read_task_id(usr_cwd)
-            if not new_task_id:
-                Console.fatal("current_task_id.txt is missing or empty after auditor review")
+            # Auditor (iteration 1 uses init timing)
+            if iteration == 1:
+                aud_duration = init_aud_duration
+            else:
+                aud_start = time.time()
+                auditor_sid = phase_auditor_review(usr_cwd, task_id, yolo, lite)
+                aud_duration = time.time() - aud_start
+                
+                # Check for stop signals after auditor
+                new_task_id = read_task_id(usr_cwd)
+                if not new_task_id:
+                    Console.fatal("current_task_id.txt is missing or empty after auditor review")
+                
+                signal = new_task_id.lower()
+                if signal == "finish":
+                    batcher.flush()
+                    Console.done()
+                    Console.info(f"🎉 Project released in {iteration - 1} iteration(s)")
+                    Console.info(f"Branch: {branch}")
+                    return
+                
+                if signal == "abort":
+                    batcher.flush()
+                    Console.aborted()
+                    Console.info(f"💀 Project killed after {iteration - 1} iteration(s)")
+                    Console.info(f"Branch: {branch}")
+                    Console.warn("Check Project_Roadmap.md for termination reason")
+                    sys.exit(1)
+                
+                if new_task_id != task_id:
+                    task_id = new_task_id
+                    Console.info(f"New task: {task_id}")
             
-            signal = new_task_id.lower()
-            if signal == "finish":
-                Console.done()
-                Console.info(f"🎉 Project released in {iteration - 1} iteration(s)")
-                Console.info(f"Branch: {branch}")
-                return
+            # Commander
+            # Phases stay sequential: every codex run rewrites usr_cwd/AGENTS.md
+            # with its role file, and the commander's task_id is only final once
+            # the auditor has written current_task_id.txt.
+            cmd_start = time.time()
+            commander_sid = phase_commander(usr_cwd, task_id, yolo, lite, skip_cached)
+            cmd_duration = time.time() - cmd_start
             
-            if signal == "abort":
-                Console.aborted()
-                Console.info(f"💀 Project killed after {iteration - 1} iteration(s)")
-                Console.info(f"Branch: {branch}")
-                Console.warn("Check Project_Roadmap.md for termination reason")
-                sys.exit(1)
+            # Generator (formerly Executor)
+            gen_start = time.time()
+            generator_sid = phase_generator(usr_cwd, task_id, yolo, lite, skip_cached)
+            gen_duration = time.time() - gen_start
             
-            if new_task_id != task_id:
-                task_id = new_task_id
-                Console.info(f"New task: {task_id}")
-        
-        # Commander
-        cmd_start = time.time()
-        commander_sid = phase_commander(usr_cwd, task_id, yolo, lite)
-        cmd_duration = time.time() - cmd_start
-        
-        # Generator (formerly Executor)
-        gen_start = time.time()
-        generator_sid = phase_generator(usr_cwd, task_id, yolo, lite)
-        gen_duration = time.time() - gen_start
-        
-        # Reflector (new ACE-style phase)
-        ref_start = time.time()
-        reflector_sid = phase_reflector(usr_cwd, task_id, yolo, lite)
-        ref_duration = time.time() - ref_start
-        
-        # Ensure all codex output is flushed before printing timing
-        sys.stdout.flush()
-        sys.stderr.flush()
-        time.sleep(0.5)  # Brief delay for any async output to complete
-        
-        # Print timing before user feedback
-        Console.info("─" * 40)
-        Console.info(f"⏱️  Auditor:    {format_duration(aud_duration)}")
-        Console.info(f"⏱️  Commander:  {format_duration(cmd_duration)}")
-        Console.info(f"⏱️  Generator:  {format_duration(gen_duration)}")
-        Console.info(f"⏱️  Reflector:  {format_duration(ref_duration)}")
-        Console.info(f"⏱️  Total:      {format_duration(time.time() - iter_start)}")
-        Console.info(f"🕐 Completed: {datetime.now().strftime('%y/%m/%d %H:%M:%S')}")
-        Console.info("─" * 40)
-        
-        # Step mode: pause for user feedback before commit
-        if step:
-            user_feedback = prompt_user_feedback()
-            if user_feedback is None:
-                Console.info("User requested quit")
-                return
-            if user_feedback:
-                # Store feedback for next auditor review
-                feedback_file = usr_cwd / "context" / "user_feedback.txt"
-                feedback_file.write_text(user_feedback, encoding="utf-8")
-                Console.info(f"Feedback saved: {user_feedback[:50]}{'...' if len(user_feedback) > 50 else ''}")
+            # Reflector (new ACE-style phase)
+            ref_start = time.time()
+            reflector_sid = phase_reflector(usr_cwd, task_id, yolo, lite)
+            ref_duration = time.time() - ref_start
+            
+            # Ensure all codex output is flushed before printing timing. The worker
+            # writes its response only after the codex child has exited and the
+            # unbuffered (-u) worker stderr has been written, so no delay is needed.
+            sys.stdout.flush()
+            sys.stderr.flush()
+            
+            # Print timing before user feedback
+            Console.info("─" * 40)
+            Console.info(f"⏱️  Auditor:    {format_duration(aud_duration)}")
+            Console.info(f"⏱️  Commander:  {format_duration(cmd_duration)}")
+            Console.info(f"⏱️  Generator:  {format_duration(gen_duration)}")
+            Console.info(f"⏱️  Reflector:  {format_duration(ref_duration)}")
+            Console.info(f"⏱️  Total:      {format_duration(time.time() - iter_start)}")
+            Console.info(f"🕐 Completed: {datetime.now().strftime('%y/%m/%d %H:%M:%S')}")
+            Console.info("─" * 40)
+            
+            # Step mode: pause for user feedback before commit
+            if step:
+                user_feedback = prompt_user_feedback()
+                if user_feedback is None:
+                    batcher.flush()
+                    Console.info("User requested quit")
+                    return
+                if user_feedback:
+                    # Store feedback for next auditor review
+                    with open(os.path.join(context_dir, FEEDBACK_FILE), "w", encoding="utf-8") as f:
+                        f.write(user_feedback)
+                    Console.info(f"Feedback saved: {user_feedback[:50]}{'...' if len(user_feedback) > 50 else ''}")
+            
+            # Commit (after user feedback)
+            batcher.add(task_id, commander_sid, generator_sid, reflector_sid)
         
-        # Commit (after user feedback)
-        commit_iteration(usr_cwd, task_id, commander_sid, generator_sid, reflector_sid)
-    
-    Console.error(f"Max iterations ({max_iterations}) reached without completion")
-    sys.exit(1)
+        batcher.flush()
+        Console.error(f"Max iterations ({max_iterations}) reached without completion")
+        sys.exit(1)
+    except BaseException:
+        # Fatal error or Ctrl-C: the working tree may hold a half-finished
+        # iteration, so it must not be committed under the pending messages
+        batcher.abandon()
+        raise
 
 
 # ============================================================================
 # CLI
 # ============================================================================
 
-def parse_cli_args() -> argparse.Namespace:
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser (no parsing, usable in-process)."""
     parser = argparse.ArgumentParser(
         description="ACE Orchestrator - Drive AI collaboration to complete tasks",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -770,7 +1215,36 @@ def parse_cli_args() -> argparse.Namespace:
         help="Use full role definitions (more detailed)"
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        "--commit-batch-size",
+        type=int,
+        default=1,
+        help="Commit once every N iterations (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--skip-cached",
+        action="store_true",
+        default=False,
+        help="Skip commander/generator when their output is newer than current_task_id.txt"
+    )
+    
+    parser.add_argument(
+        "--no-prewarm",
+        action="store_false",
+        dest="prewarm",
+        help="Start the codex worker lazily on the first phase"
+    )
+    
+    return parser
+
+
+def parse_cli_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.commit_batch_size < 1:
+        parser.error("--commit-batch-size must be >= 1")
     
     # Validate: --init requires --requirement
     if args.init and not args.requirement:
@@ -799,7 +1273,10 @@ def main():
             yolo=args.yolo,
             step=args.step,
             new_branch=args.new_branch,
-            lite=args.lite
+            lite=args.lite,
+            commit_batch_size=args.commit_batch_size,
+            skip_cached=args.skip_cached,
+            prewarm=args.prewarm
         )
     except GitError as e:
         Console.fatal(f"Git error: {e}")
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Unit tests for codex.py module."""
+import io
+import json
 import os
 import sys
 import tempfile
+import threading
 from pathlib import Path
 from unittest import mock
 
+import pytest
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
@@ -25,6 +30,17 @@ class TestNormalizeText:
         assert codex.normalize_text(None) is None
 
 
+class TestFirstNLines:
+    def test_short_text_unchanged(self):
+        assert codex._first_n_lines("a\nb", 10) == ("a\nb", 0)
+
+    def test_truncates_and_counts_rest(self):
+        text = "\n".join(str(i) for i in range(25))
+        head, more = codex._first_n_lines(text, 10)
+        assert head == "\n".join(str(i) for i in range(10))
+        assert more == 15
+
+
 class TestShouldStreamViaStdin:
     def test_piped_true(self):
         assert codex.should_stream_via_stdin("short", piped=True) is True
@@ -43,9 +59,30 @@ class TestShouldStreamViaStdin:
         assert codex.should_stream_via_stdin("simple task", piped=False) is False
 
 
+class TestReadPipedTask:
+    def test_select_unsupported_falls_back_to_fstat(self, tmp_path: Path):
+        task_file = tmp_path / "task.txt"
+        task_file.write_text("piped task", encoding="utf-8")
+        with open(task_file, encoding="utf-8") as f, \
+                mock.patch.object(codex.sys, 'stdin', f), \
+                mock.patch.object(codex.select, 'select', side_effect=OSError("not a socket")):
+            assert codex.read_piped_task() == "piped task"
+
+
 class TestResolveUsrCwd:
     def test_valid_directory(self, tmp_path: Path):
         result = codex.resolve_usr_cwd(str(tmp_path))
+        assert result.resolve() == tmp_path.resolve()
+
+    def test_absolute_path_fast_path(self, tmp_path: Path):
+        with mock.patch.object(codex.Path, 'resolve') as mock_resolve:
+            result = codex.resolve_usr_cwd(str(tmp_path))
+        assert result == tmp_path
+        mock_resolve.assert_not_called()
+
+    def test_parent_components_resolved(self, tmp_path: Path):
+        (tmp_path / "a").mkdir()
+        result = codex.resolve_usr_cwd(str(tmp_path / "a" / ".."))
         assert result == tmp_path.resolve()
 
     def test_relative_path(self, tmp_path: Path):
@@ -215,6 +252,182 @@ class TestBuildCodexArgs:
             assert '--full-auto' in args
 
 
+class TestDaemon:
+    def test_parse_daemon_flag(self):
+        with mock.patch.object(sys, 'argv', ['codex.py', '--daemon']):
+            assert codex.parse_args() == {'mode': 'daemon'}
+
+    def test_serve_daemon_frames_responses(self, capsys):
+        requests = '{"role": "auditor", "usr_cwd": "/p", "task": "t1"}\nnot json\n'
+        with mock.patch.object(sys, 'stdin', io.StringIO(requests)), \
+                mock.patch.object(codex, 'execute_task', return_value=('done', 'sid-1')) as mock_exec:
+            codex.serve_daemon()
+        
+        params = mock_exec.call_args[0][0]
+        assert params['mode'] == 'new'
+        assert params['role'] == 'auditor'
+        
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1] == codex.DAEMON_END_MARKER
+        assert lines[3] == codex.DAEMON_END_MARKER
+        first = json.loads(lines[0])
+        assert first['status'] == 0
+        assert first['session_id'] == 'sid-1'
+        assert 'SESSION_ID: sid-1' in first['output']
+        assert json.loads(lines[2])['status'] == 2
+
+    def test_shutdown_stops_serving(self, capsys):
+        requests = '{"cmd": "shutdown"}\n{"task": "never"}\n'
+        with mock.patch.object(sys, 'stdin', io.StringIO(requests)), \
+                mock.patch.object(codex, 'execute_task') as mock_exec:
+            codex.serve_daemon()
+        mock_exec.assert_not_called()
+        assert capsys.readouterr().out == ''
+
+    def test_failed_request_reports_exit_code(self):
+        with mock.patch.object(codex, 'execute_task', side_effect=SystemExit(124)):
+            response = codex.handle_daemon_request({'task': 't'})
+        assert response['status'] == 124
+
+
+class TestRunCodexProcess:
+    def test_timeout_kills_process_on_main_thread(self):
+        args = ['codex', '-c', 'import time; time.sleep(30)']
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable), \
+                mock.patch.object(codex, '_start_watchdog', wraps=codex._start_watchdog) as mock_watchdog:
+            with pytest.raises(SystemExit, match="^124$"):
+                codex.run_codex_process(args, 'task', use_stdin=False, timeout_sec=1)
+        mock_watchdog.assert_called_once()
+        process = mock_watchdog.call_args[0][0]
+        assert process.returncode is not None and process.returncode != 0
+
+    def test_timeout_kills_process_via_watchdog(self):
+        args = ['codex', '-c', 'import time; time.sleep(30)']
+        result = {}
+
+        def run():
+            try:
+                codex.run_codex_process(args, 'task', use_stdin=False, timeout_sec=1)
+            except SystemExit as e:
+                result['code'] = e.code
+
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable):
+            worker = threading.Thread(target=run)
+            worker.start()
+            worker.join(20)
+        assert not worker.is_alive()
+        assert result.get('code') == 124
+
+    def test_daemon_request_survives_timeout(self):
+        args = ['codex', '-c', 'import time; time.sleep(30)']
+
+        def run(params, allow_piped=True):
+            return codex.run_codex_process(args, 'task', use_stdin=False, timeout_sec=1)
+
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable), \
+                mock.patch.object(codex, 'execute_task', side_effect=run):
+            response = codex.handle_daemon_request({'task': 't'})
+        assert response['status'] == 124
+
+    def test_parses_event_stream(self):
+        events = [
+            {"type": "thread.started", "thread_id": "t-1"},
+            {"type": "turn.started"},
+            {"type": "item.completed", "item": {"type": "agent_message", "text": "first"}},
+            {"type": "item.completed", "item": {"type": "agent_message", "text": "final"}},
+        ]
+        script = "import sys\n" + "".join(
+            f"print({json.dumps(json.dumps(e))})\n" for e in events
+        ) + "print('not json')\n"
+        args = ['codex', '-c', script]
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable):
+            message, thread_id = codex.run_codex_process(args, 'task', use_stdin=False, timeout_sec=30)
+        assert message == "final"
+        assert thread_id == "t-1"
+
+    def test_unconsumed_events_not_parsed(self):
+        events = [
+            {"type": "turn.started"},
+            {"type": "item.completed", "item": {"type": "agent_message", "text": "done"}},
+        ]
+        script = "".join(f"print({json.dumps(json.dumps(e))})\n" for e in events)
+        args = ['codex', '-c', script]
+        parsed = []
+
+        def spy_loads(data):
+            parsed.append(data)
+            return json.loads(data)
+
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable), \
+                mock.patch.object(codex, '_json_loads', spy_loads), \
+                mock.patch.dict(os.environ, {'CODEX_VERBOSE': ''}):
+            message, _ = codex.run_codex_process(args, 'task', use_stdin=False, timeout_sec=30)
+        assert message == "done"
+        assert len(parsed) == 1
+
+    def test_utf8_events_with_stdlib_json(self):
+        event = {"type": "item.completed", "item": {"type": "agent_message", "text": "任务完成"}}
+        script = (
+            "import sys\n"
+            f"sys.stdout.buffer.write({json.dumps(event, ensure_ascii=False).encode('utf-8')!r} + b'\\n')\n"
+        )
+        args = ['codex', '-c', script]
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable), \
+                mock.patch.object(codex, '_json_loads', json.loads):
+            message, _ = codex.run_codex_process(args, 'task', use_stdin=False, timeout_sec=30)
+        assert message == "任务完成"
+
+    def test_large_stdin_task_does_not_deadlock(self):
+        # codex 先输出超过管道容量的数据再读 stdin：同步写入 stdin 会互相阻塞
+        script = (
+            "import json, sys\n"
+            "print(json.dumps({'type': 'item.started', 'item': {'type': 'x'}, 'pad': 'a' * 300000}), flush=True)\n"
+            "data = sys.stdin.read()\n"
+            "print(json.dumps({'type': 'item.completed', 'item': {'type': 'agent_message', 'text': str(len(data))}}))\n"
+        )
+        task = "x" * 1000000
+        args = ['codex', '-c', script]
+        with mock.patch.object(codex, 'find_codex_executable', return_value=sys.executable):
+            message, _ = codex.run_codex_process(args, task, use_stdin=True, timeout_sec=30)
+        assert message == str(len(task))
+
+
+class TestFindCodexExecutable:
+    def test_resolved_once(self):
+        with mock.patch.object(codex, '_codex_path', None), \
+                mock.patch.dict(os.environ, {}, clear=True), \
+                mock.patch.object(codex.shutil, 'which', return_value='/opt/bin/codex') as mock_which:
+            assert codex.find_codex_executable() == '/opt/bin/codex'
+            assert codex.find_codex_executable() == '/opt/bin/codex'
+        assert mock_which.call_count == 1
+
+    def test_env_override_skips_path_lookup(self):
+        with mock.patch.object(codex, '_codex_path', None), \
+                mock.patch.dict(os.environ, {'CODEX_BINARY': '/custom/codex'}), \
+                mock.patch.object(codex.shutil, 'which') as mock_which:
+            assert codex.find_codex_executable() == '/custom/codex'
+        mock_which.assert_not_called()
+
+
+class TestFileLogging:
+    def test_file_records_written_via_queue(self, tmp_path: Path):
+        ace_logger = codex.logging.getLogger('ACE')
+        saved_handlers = list(ace_logger.handlers)
+        try:
+            with mock.patch.object(codex, '_logger', None), \
+                    mock.patch.object(codex, '_log_file_path', None), \
+                    mock.patch.object(codex, '_log_listener', None):
+                codex.set_log_dir(tmp_path)
+                codex.set_log_dir(tmp_path)  # 不重复挂载文件 handler
+                codex.log_debug("queued record")
+                codex._stop_log_listener()
+                content = (tmp_path / 'ACE.log').read_text(encoding='utf-8')
+        finally:
+            ace_logger.handlers[:] = saved_handlers
+        assert content.count("queued record") == 1
+        assert "[DEBUG]" in content
+
+
 class TestResolveTimeout:
     def test_default_timeout(self):
         with mock.patch.dict(os.environ, {}, clear=True):
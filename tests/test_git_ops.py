@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Unit tests for git_ops module."""
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
+from unittest import mock
+
+import pytest
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -14,11 +19,11 @@ from tools.git_ops import (
     get_current_branch,
     branch_exists,
     create_branch,
-    stage_all,
-    commit,
     stage_and_commit,
     has_uncommitted_changes,
     ensure_git_repo,
+    _status_v2,
+    set_git_binary,
 )
 
 
@@ -58,6 +63,35 @@ class TestGetCurrentBranch:
         subprocess.run(["git", "checkout", "-b", "feature-x"], cwd=tmp_path, capture_output=True)
         assert get_current_branch(tmp_path) == "feature-x"
 
+    def test_memoized_until_cleared(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        branch = get_current_branch(tmp_path)
+        subprocess.run(["git", "checkout", "-b", "feature-y"], cwd=tmp_path, capture_output=True)
+        assert get_current_branch(tmp_path) == branch
+        
+        get_current_branch.cache_clear()
+        assert get_current_branch(tmp_path) == "feature-y"
+
+
+class TestGitBinary:
+    def test_resolved_once_from_path(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        set_git_binary(None)
+        with mock.patch.object(shutil, "which", wraps=shutil.which) as mock_which:
+            assert is_git_repo(tmp_path) is True
+            assert is_git_repo(tmp_path) is True
+        assert mock_which.call_count == 1
+
+    def test_missing_binary_raises(self, tmp_path: Path):
+        set_git_binary(str(tmp_path / "no-such-git"))
+        try:
+            with pytest.raises(GitError, match="git not found") as exc_info:
+                is_git_repo(tmp_path)
+            assert exc_info.value.returncode == 127
+        finally:
+            set_git_binary(None)
+
 
 class TestBranchExists:
     def test_existing_branch(self, tmp_path: Path):
@@ -92,6 +126,18 @@ class TestCreateBranch:
         result = create_branch(tmp_path, "task/dup")
         assert result == "task/dup-1"
 
+    def test_suffix_skips_taken_names_with_one_lookup(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        for name in ("task/many", "task/many-1", "task/many-2", "task/many-x/y"):
+            subprocess.run(["git", "branch", name], cwd=tmp_path, capture_output=True, check=True)
+        
+        with mock.patch("tools.git_ops.branch_exists") as mock_exists:
+            result = create_branch(tmp_path, "task/many")
+        
+        assert result == "task/many-3"
+        mock_exists.assert_not_called()
+
 
 class TestStageAndCommit:
     def test_commit_changes(self, tmp_path: Path):
@@ -111,6 +157,81 @@ class TestStageAndCommit:
         result = stage_and_commit(tmp_path, "Empty commit")
         assert result is None
 
+    def test_commit_deletion_and_rename(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        (tmp_path / "a.txt").write_text("a")
+        stage_and_commit(tmp_path, "Add a")
+        
+        (tmp_path / "README.md").unlink()
+        subprocess.run(["git", "mv", "a.txt", "b.txt"], cwd=tmp_path, capture_output=True, check=True)
+        (tmp_path / "sub dir").mkdir()
+        (tmp_path / "sub dir" / "c.txt").write_text("c")
+        
+        assert stage_and_commit(tmp_path, "Mixed changes") is not None
+        assert has_uncommitted_changes(tmp_path) is False
+
+
+    def test_initial_commit_on_unborn_branch(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        (tmp_path / "first.txt").write_text("1")
+        
+        hash_val = stage_and_commit(tmp_path, "First\n\nbody")
+        
+        assert hash_val is not None
+        log = subprocess.run(["git", "log", "--format=%H %s"], cwd=tmp_path, capture_output=True, text=True)
+        assert log.stdout.strip() == f"{hash_val} First"
+        assert has_uncommitted_changes(tmp_path) is False
+
+    def test_ignored_files_not_committed(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        (tmp_path / "run.log").write_text("noise")
+        
+        stage_and_commit(tmp_path, "Add gitignore")
+        
+        files = subprocess.run(["git", "ls-files"], cwd=tmp_path, capture_output=True, text=True)
+        assert "run.log" not in files.stdout.split()
+
+    def test_non_ascii_path_under_c_locale(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        (tmp_path / "任务.md").write_text("x", encoding="utf-8")
+        
+        env = dict(os.environ, LC_ALL="C", PYTHONUTF8="0", PYTHONCOERCECLOCALE="0")
+        script = (
+            "import sys; from pathlib import Path; "
+            "from tools.git_ops import stage_and_commit; "
+            "print(stage_and_commit(Path(sys.argv[1]), 'Add task'))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path)],
+            cwd=Path(__file__).resolve().parent.parent,
+            env=env, capture_output=True
+        )
+        
+        assert result.returncode == 0, result.stderr.decode(errors="replace")
+        files = subprocess.run(["git", "ls-files", "-z"], cwd=tmp_path, capture_output=True)
+        assert "任务.md".encode("utf-8") in files.stdout.split(b"\0")
+        assert has_uncommitted_changes(tmp_path) is False
+
+
+class TestStatusV2:
+    def test_clean_repo(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        head, paths = _status_v2(tmp_path)
+        assert len(head) == 40
+        assert paths == []
+
+    def test_modified_and_untracked(self, tmp_path: Path):
+        init_test_repo(tmp_path)
+        create_initial_commit(tmp_path)
+        (tmp_path / "README.md").write_text("changed")
+        (tmp_path / "new file.txt").write_text("x")
+        assert sorted(_status_v2(tmp_path)[1]) == ["README.md", "new file.txt"]
+
 
 class TestHasUncommittedChanges:
     def test_clean_repo(self, tmp_path: Path):
@@ -131,11 +252,8 @@ class TestEnsureGitRepo:
         ensure_git_repo(tmp_path)  # Should not raise
 
     def test_non_repo_raises(self, tmp_path: Path):
-        try:
+        with pytest.raises(GitError, match="not inside a git repository"):
             ensure_git_repo(tmp_path)
-            assert False, "Should have raised GitError"
-        except GitError as e:
-            assert "not inside a git repository" in str(e)
 
 
 class TestIndexLockRecovery:
@@ -158,24 +276,6 @@ class TestIndexLockRecovery:
         assert hash_val is not None
         assert not lock_file.exists()  # Lock should be cleared
 
-    def test_commit_with_stale_lock(self, tmp_path: Path):
-        """Commit should work after auto-clearing stale lock."""
-        init_test_repo(tmp_path)
-        create_initial_commit(tmp_path)
-        
-        (tmp_path / "file.txt").write_text("data")
-        subprocess.run(["git", "add", "-A"], cwd=tmp_path, capture_output=True)
-        
-        # Create lock after staging
-        lock_file = tmp_path / ".git" / "index.lock"
-        lock_file.write_text("lock")
-        
-        # Import commit function
-        from tools.git_ops import commit
-        hash_val = commit(tmp_path, "Test commit")
-        
-        assert hash_val is not None
-
 
 if __name__ == "__main__":
     # Run with pytest if available, otherwise basic execution
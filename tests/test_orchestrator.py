@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 """Unit tests for Orchestrator.py module."""
+import os
 import subprocess
 import sys
 from pathlib import Path
 from unittest import mock
 
+import pytest
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import Orchestrator
-from Orchestrator import Console, read_task_id, file_exists
+from Orchestrator import Console, read_task_id
 
 
 class TestConsole:
@@ -39,6 +42,14 @@ class TestConsole:
         assert "[ERROR]" in captured.out
         assert "error message" in captured.out
 
+    def test_warn_and_error_flush(self, capsys):
+        with mock.patch.object(Console, 'flush') as mock_flush:
+            Console.info("buffered")
+            mock_flush.assert_not_called()
+            Console.warn("retrying")
+            Console.error("failed")
+        assert mock_flush.call_count == 2
+
     def test_banner_prints(self, capsys):
         Console.banner("TEST BANNER")
         captured = capsys.readouterr()
@@ -52,6 +63,17 @@ class TestConsole:
         assert "auditor" in captured.out
 
 
+class TestFormatDuration:
+    def test_seconds(self):
+        assert Orchestrator.format_duration(5.25) == "5.2s"
+
+    def test_minutes(self):
+        assert Orchestrator.format_duration(125.5) == "2m 5.5s"
+
+    def test_hours(self):
+        assert Orchestrator.format_duration(3725.4) == "1h 2m 5s"
+
+
 class TestReadTaskId:
     def test_existing_file(self, tmp_path: Path):
         context = tmp_path / "context"
@@ -84,57 +106,255 @@ class TestReadTaskId:
         result = read_task_id(tmp_path)
         assert result == "Task-002"
 
+    def test_rewrite_invalidates_cache(self, tmp_path: Path):
+        context = tmp_path / "context"
+        context.mkdir()
+        task_file = context / "current_task_id.txt"
+        task_file.write_text("Task-001")
+        assert read_task_id(tmp_path) == "Task-001"
+        
+        task_file.write_text("Task-0002")
+        assert read_task_id(tmp_path) == "Task-0002"
+        
+        task_file.unlink()
+        assert read_task_id(tmp_path) is None
 
-class TestFileExists:
-    def test_existing_file(self, tmp_path: Path):
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("content")
+    def test_auditor_review_invalidates_cache(self, tmp_path: Path):
+        context = tmp_path / "context"
+        context.mkdir()
+        task_file = context / "current_task_id.txt"
+        task_file.write_text("Task-001")
+        os.utime(task_file, ns=(1_000_000_000, 1_000_000_000))
+        assert read_task_id(tmp_path) == "Task-001"
+        
+        def rewrite_same_stat(*args, **kwargs):
+            # Same size and mtime: only an explicit invalidation can catch this
+            task_file.write_text("Task-002")
+            os.utime(task_file, ns=(1_000_000_000, 1_000_000_000))
+            return "ok", "sid"
+        
+        with mock.patch.object(Orchestrator, 'invoke_codex', side_effect=rewrite_same_stat):
+            Orchestrator.phase_auditor_review(tmp_path, "Task-001")
+        
+        assert read_task_id(tmp_path) == "Task-002"
+
+
+class TestFileReady:
+    def test_non_empty_file(self, tmp_path: Path):
+        (tmp_path / "brief.md").write_text("content")
+        
+        assert Orchestrator.file_ready(tmp_path, "brief.md") is True
+
+    def test_empty_file(self, tmp_path: Path):
+        (tmp_path / "brief.md").write_text("")
         
-        assert file_exists(tmp_path, "test.txt") is True
+        assert Orchestrator.file_ready(tmp_path, "brief.md") is False
 
     def test_missing_file(self, tmp_path: Path):
-        assert file_exists(tmp_path, "nonexistent.txt") is False
+        assert Orchestrator.file_ready(tmp_path, "brief.md") is False
 
     def test_nested_path(self, tmp_path: Path):
         nested = tmp_path / "a" / "b"
         nested.mkdir(parents=True)
         (nested / "file.md").write_text("content")
         
-        assert file_exists(tmp_path, "a/b/file.md") is True
+        assert Orchestrator.file_ready(tmp_path, "a/b/file.md") is True
 
 
-class TestCLI:
-    def test_help_works(self):
-        result = subprocess.run(
-            [sys.executable, "Orchestrator.py", "--help"],
-            cwd=str(Path(__file__).resolve().parent.parent),
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0
-        assert "--usr-cwd" in result.stdout
-        assert "--requirement" in result.stdout
-        assert "--branch-prefix" in result.stdout
-
-    def test_missing_args_fails(self):
-        result = subprocess.run(
-            [sys.executable, "Orchestrator.py"],
-            cwd=str(Path(__file__).resolve().parent.parent),
-            capture_output=True,
-            text=True
+class TestPhaseCache:
+    def _setup(self, tmp_path: Path) -> Path:
+        context = tmp_path / "context"
+        context.mkdir()
+        task_file = context / "current_task_id.txt"
+        task_file.write_text("Task-001")
+        os.utime(task_file, ns=(1_000_000_000, 1_000_000_000))
+        return context
+
+    def test_fresh_artifact_returns_recorded_session(self, tmp_path: Path):
+        context = self._setup(tmp_path)
+        (context / "AI_Task_Brief_Task-001.md").write_text("brief")
+        Orchestrator.record_phase_session(tmp_path, "commander", "Task-001", "sid-1")
+        
+        assert Orchestrator.cached_phase_session(
+            tmp_path, "commander", "Task-001", "context/AI_Task_Brief_Task-001.md"
+        ) == "sid-1"
+
+    def test_stale_artifact_not_cached(self, tmp_path: Path):
+        context = self._setup(tmp_path)
+        brief = context / "AI_Task_Brief_Task-001.md"
+        brief.write_text("brief")
+        os.utime(brief, ns=(500_000_000, 500_000_000))
+        Orchestrator.record_phase_session(tmp_path, "commander", "Task-001", "sid-1")
+        
+        assert Orchestrator.cached_phase_session(
+            tmp_path, "commander", "Task-001", "context/AI_Task_Brief_Task-001.md"
+        ) is None
+
+    def test_skip_cached_avoids_codex(self, tmp_path: Path):
+        context = self._setup(tmp_path)
+        (context / "Execution_Log_Task-001.md").write_text("log")
+        digest = Orchestrator.phase_inputs_digest(tmp_path, "generator", "Task-001")
+        Orchestrator.record_phase_session(tmp_path, "generator", "Task-001", "sid-2", digest)
+        
+        with mock.patch.object(Orchestrator, 'invoke_codex') as mock_invoke:
+            sid = Orchestrator.phase_generator(tmp_path, "Task-001", skip_cached=True)
+        
+        assert sid == "sid-2"
+        mock_invoke.assert_not_called()
+
+    def test_cache_untouched_without_skip_cached(self, tmp_path: Path):
+        context = self._setup(tmp_path)
+        
+        def write_brief(*args, **kwargs):
+            (context / "AI_Task_Brief_Task-001.md").write_text("brief")
+            return "ok", "sid-3"
+        
+        with mock.patch.object(Orchestrator, 'invoke_codex', side_effect=write_brief), \
+             mock.patch.object(Orchestrator, 'phase_inputs_digest') as mock_digest:
+            assert Orchestrator.phase_commander(tmp_path, "Task-001") == "sid-3"
+        
+        mock_digest.assert_not_called()
+        assert not (tmp_path / Orchestrator.PHASE_CACHE_FILE).exists()
+
+    def test_changed_inputs_not_cached(self, tmp_path: Path):
+        context = self._setup(tmp_path)
+        (context / "AI_Task_Brief_Task-001.md").write_text("brief v1")
+        (context / "Execution_Log_Task-001.md").write_text("log")
+        digest = Orchestrator.phase_inputs_digest(tmp_path, "generator", "Task-001")
+        Orchestrator.record_phase_session(tmp_path, "generator", "Task-001", "sid-2", digest)
+        
+        (context / "AI_Task_Brief_Task-001.md").write_text("brief v2")
+        new_digest = Orchestrator.phase_inputs_digest(tmp_path, "generator", "Task-001")
+        
+        assert new_digest != digest
+        assert Orchestrator.cached_phase_session(
+            tmp_path, "generator", "Task-001", "context/Execution_Log_Task-001.md", new_digest
+        ) is None
+
+    def test_digest_distinguishes_missing_and_empty(self, tmp_path: Path):
+        context = self._setup(tmp_path)
+        missing = Orchestrator.phase_inputs_digest(tmp_path, "commander", "Task-001")
+        (context / "Project_Roadmap.md").write_text("")
+        
+        assert Orchestrator.phase_inputs_digest(tmp_path, "commander", "Task-001") != missing
+
+
+class TestAuditorReview:
+    def test_feedback_claimed_and_forwarded(self, tmp_path: Path):
+        context = tmp_path / "context"
+        context.mkdir()
+        (context / "user_feedback.txt").write_text("please add tests")
+        
+        with mock.patch.object(Orchestrator, 'invoke_codex', return_value=("ok", "sid")) as mock_invoke:
+            Orchestrator.phase_auditor_review(tmp_path, "Task-001")
+        
+        assert "please add tests" in mock_invoke.call_args[0][2]
+        assert not (context / "user_feedback.txt").exists()
+        assert not (context / "user_feedback.consumed").exists()
+        
+        with mock.patch.object(Orchestrator, 'invoke_codex', return_value=("ok", "sid")) as mock_invoke:
+            Orchestrator.phase_auditor_review(tmp_path, "Task-001")
+        
+        assert "please add tests" not in mock_invoke.call_args[0][2]
+
+
+class TestCommitBatcher:
+    def test_batch_size_one_commits_each_iteration(self, tmp_path: Path):
+        with mock.patch.object(Orchestrator, 'stage_and_commit', return_value="a" * 40) as mock_commit:
+            batcher = Orchestrator.CommitBatcher(tmp_path, 1)
+            batcher.add("Task-001", "c1", "g1", "r1")
+            batcher.add("Task-002", "c2", "g2")
+        
+        assert mock_commit.call_count == 2
+        assert mock_commit.call_args_list[0][0][1] == (
+            "task: Task-001\ncommander_session_id: c1\n"
+            "generator_session_id: g1\nreflector_session_id: r1"
         )
-        assert result.returncode != 0
-        assert "required" in result.stderr.lower()
+
+    def test_batches_until_full_then_flushes_rest(self, tmp_path: Path):
+        with mock.patch.object(Orchestrator, 'stage_and_commit', return_value="b" * 40) as mock_commit:
+            batcher = Orchestrator.CommitBatcher(tmp_path, 2)
+            batcher.add("Task-001", "c1", "g1")
+            assert mock_commit.call_count == 0
+            batcher.add("Task-002", "c2", "g2")
+            assert mock_commit.call_count == 1
+            message = mock_commit.call_args[0][1]
+            assert "task: Task-001" in message and "task: Task-002" in message
+            
+            batcher.add("Task-003", "c3", "g3")
+            batcher.flush()
+            assert mock_commit.call_count == 2
+            assert batcher.flush() is None
+
+    def test_error_mid_batch_does_not_commit(self, tmp_path: Path):
+        generator_calls = []
+        
+        def generator(*args, **kwargs):
+            generator_calls.append(args)
+            if len(generator_calls) == 2:
+                Orchestrator.Console.fatal("generator failed")
+            return "g"
+        
+        with mock.patch.object(Orchestrator, 'ensure_git_repo'), \
+             mock.patch.object(Orchestrator, 'set_log_dir'), \
+             mock.patch.object(Orchestrator, 'phase_init', return_value=("Task-001", "main", "a")), \
+             mock.patch.object(Orchestrator, 'phase_auditor_review', return_value="a"), \
+             mock.patch.object(Orchestrator, 'read_task_id', return_value="Task-001"), \
+             mock.patch.object(Orchestrator, 'phase_commander', return_value="c"), \
+             mock.patch.object(Orchestrator, 'phase_generator', side_effect=generator), \
+             mock.patch.object(Orchestrator, 'phase_reflector', return_value="r"), \
+             mock.patch.object(Orchestrator, 'stage_and_commit') as mock_commit, \
+             mock.patch.object(Orchestrator, '_codex_worker') as mock_worker:
+            with pytest.raises(SystemExit):
+                Orchestrator.run_orchestration(tmp_path, "req", commit_batch_size=3, prewarm=False)
+        
+        mock_commit.assert_not_called()
+        mock_worker.start.assert_not_called()
+
+
+class TestCLI:
+    def test_help_works(self, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            Orchestrator.parse_cli_args(["--help"])
+        
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert out.startswith("usage:")
+        assert "--usr-cwd" in out
+
+    def test_help_lists_options(self, capsys):
+        parser = Orchestrator.build_parser()
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(["--help"])
+        
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert "--usr-cwd" in out
+        assert "--requirement" in out
+        assert "--branch-prefix" in out
+        assert "--commit-batch-size" in out
+
+    def test_missing_args_fails(self, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            Orchestrator.parse_cli_args([])
+        
+        assert exc_info.value.code != 0
+        assert "required" in capsys.readouterr().err.lower()
+
+    def test_batch_size_validated(self, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            Orchestrator.parse_cli_args(["-r", "-d", ".", "--commit-batch-size", "0"])
+        
+        assert exc_info.value.code != 0
+        assert "--commit-batch-size" in capsys.readouterr().err
 
 
 class TestInvokeCodex:
     def test_successful_invocation(self, tmp_path: Path):
-        """Test that invoke_codex calls subprocess.Popen correctly."""
-        mock_process = mock.MagicMock()
-        mock_process.returncode = 0
-        mock_process.communicate.return_value = ("Task completed\n---\nSESSION_ID: abc123", None)
+        """Test that invoke_codex sends one request to the codex worker."""
+        response = {"status": 0, "output": "Task completed\n---\nSESSION_ID: abc123\n"}
         
-        with mock.patch.object(subprocess, 'Popen', return_value=mock_process) as mock_popen:
+        with mock.patch.object(Orchestrator._codex_worker, 'request', return_value=response) as mock_request:
             output, session_id = Orchestrator.invoke_codex(
                 role="auditor",
                 usr_cwd=tmp_path,
@@ -143,63 +363,81 @@ class TestInvokeCodex:
             
             assert session_id == "abc123"
             assert "Task completed" in output
-            mock_popen.assert_called_once()
+            mock_request.assert_called_once()
+            payload = mock_request.call_args[0][0]
+            assert payload["role"] == "auditor"
+            assert payload["task"] == "test task"
+
+    def test_session_id_field_preferred(self, tmp_path: Path):
+        response = {"status": 0, "output": "done", "session_id": "sid-9"}
+        
+        with mock.patch.object(Orchestrator._codex_worker, 'request', return_value=response):
+            output, session_id = Orchestrator.invoke_codex(
+                role="auditor",
+                usr_cwd=tmp_path,
+                task="test task"
+            )
+        
+        assert output == "done"
+        assert session_id == "sid-9"
 
     def test_failed_invocation_raises(self, tmp_path: Path):
-        mock_process = mock.MagicMock()
-        mock_process.returncode = 1
-        mock_process.communicate.return_value = ("", None)
+        response = {"status": 1, "output": ""}
         
-        with mock.patch.object(subprocess, 'Popen', return_value=mock_process):
-            try:
+        with mock.patch.object(Orchestrator._codex_worker, 'request', return_value=response) as mock_request, \
+                mock.patch.object(Orchestrator, 'RETRY_DELAY_SECONDS', 0):
+            with pytest.raises(RuntimeError, match="exited with code 1"):
                 Orchestrator.invoke_codex(
                     role="commander",
                     usr_cwd=tmp_path,
                     task="test"
                 )
-                assert False, "Should have raised RuntimeError"
-            except RuntimeError as e:
-                assert "exited with code 1" in str(e)
+            assert mock_request.call_count == Orchestrator.MAX_CODEX_RETRIES
 
     def test_timeout_raises(self, tmp_path: Path):
-        mock_process = mock.MagicMock()
-        mock_process.communicate.side_effect = subprocess.TimeoutExpired(cmd="test", timeout=10)
+        timeout_error = subprocess.TimeoutExpired(cmd="test", timeout=10)
         
-        with mock.patch.object(subprocess, 'Popen', return_value=mock_process):
-            try:
+        with mock.patch.object(Orchestrator._codex_worker, 'request', side_effect=timeout_error), \
+                mock.patch.object(Orchestrator._codex_worker, 'stop') as mock_stop, \
+                mock.patch.object(Orchestrator, 'RETRY_DELAY_SECONDS', 0):
+            with pytest.raises(RuntimeError, match="timed out"):
                 Orchestrator.invoke_codex(
                     role="executor",
                     usr_cwd=tmp_path,
                     task="test",
                     timeout=10
                 )
-                assert False, "Should have raised RuntimeError"
-            except RuntimeError as e:
-                assert "timed out" in str(e)
+            assert mock_stop.called
 
 
-if __name__ == "__main__":
-    try:
-        import pytest
-        sys.exit(pytest.main([__file__, "-v"]))
-    except ImportError:
-        print("pytest not installed, running basic tests...")
+class TestCodexWorker:
+    def test_request_reads_framed_response(self):
+        process = mock.MagicMock()
+        process.poll.return_value = None
+        process.stdout = iter([
+            '{"status": 0, "output": "ok", "session_id": "s1"}\n',
+            Orchestrator.DAEMON_END_MARKER + "\n",
+        ])
         
-        import tempfile
+        worker = Orchestrator.CodexWorker()
+        with mock.patch.object(subprocess, 'Popen', return_value=process) as mock_popen:
+            response = worker.request({"task": "t"}, timeout=5)
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp = Path(tmpdir)
-            
-            # Test read_task_id
-            assert read_task_id(tmp) is None
-            context = tmp / "context"
-            context.mkdir()
-            (context / "current_task_id.txt").write_text("Test-001")
-            assert read_task_id(tmp) == "Test-001"
-            
-            # Test file_exists
-            (tmp / "exists.txt").write_text("x")
-            assert file_exists(tmp, "exists.txt") is True
-            assert file_exists(tmp, "nope.txt") is False
-            
-            print("Basic orchestrator tests passed!")
+        assert response == {"status": 0, "output": "ok", "session_id": "s1"}
+        assert "--daemon" in mock_popen.call_args[0][0]
+        process.stdin.write.assert_called_once()
+
+    def test_worker_exit_raises(self):
+        process = mock.MagicMock()
+        process.poll.return_value = None
+        process.stdout = iter([])
+        
+        worker = Orchestrator.CodexWorker()
+        with mock.patch.object(subprocess, 'Popen', return_value=process):
+            with pytest.raises(RuntimeError, match="exited unexpectedly"):
+                worker.request({"task": "t"}, timeout=5)
+        assert worker.process is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -12,26 +12,45 @@ Usage:
     Resume:       uv run codex.py --role auditor --usr-cwd DIR resume <session_id> "task"
     Alternative:  python3 codex.py "task" [--role auditor]
     Direct exec:  ./codex.py "task" [--usr-cwd DIR]
+    Daemon:       python3 codex.py --daemon   (newline-delimited JSON requests on stdin)
 
 Role handling: -role/--role copies <orchestrator>/role/<name>.md to <usr_cwd>/AGENTS.md before invoking codex.
 usr_cwd: falls back to positional workdir (or '.') when --usr-cwd is not provided.
 
     Model configuration: Set CODEX_MODEL environment variable (default: gpt-5.1-codex)
+    Binary override: Set CODEX_BINARY to skip the PATH lookup for codex
 """
+import atexit
 import subprocess
 import json
 import sys
 import os
+import queue
 import shutil
 import logging
+import logging.handlers
 import datetime
+import select
+import stat
+import threading
 import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+# 可选依赖：有 orjson 时用它解析 codex 事件流，否则退回标准库 json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# run_codex_process 实际消费的事件类型（按原始字节预筛，命中才做 JSON 解析）
+_CONSUMED_EVENT_MARKERS = (b'"thread.started"', b'"item.started"', b'"item.completed"')
 
 DEFAULT_WORKDIR = '.'
 DEFAULT_TIMEOUT = 1800  # 2 hours in seconds
 FORCE_KILL_DELAY = 5
+DAEMON_END_MARKER = '<<<END>>>'
 SCRIPT_DIR = Path(__file__).resolve().parent
 ORCHESTRATOR_ROOT = SCRIPT_DIR.parent
 ROLE_DIR = ORCHESTRATOR_ROOT / 'role'
@@ -42,9 +61,20 @@ COLOR_RED = '\033[91m'
 COLOR_YELLOW = '\033[93m'
 COLOR_RESET = '\033[0m'
 
+# PROMPT TO CODEX 横幅（固定部分预先拼好）
+_BANNER_RULE = f"\033[35m{'─' * 60}{COLOR_RESET}\n"
+_PROMPT_BANNER_HEAD = (
+    f"\n{_BANNER_RULE}"
+    f"\033[35m\033[1m📋 PROMPT TO CODEX:{COLOR_RESET}\n"
+    f"{_BANNER_RULE}"
+    "\033[36m"
+)
+_PROMPT_BANNER_TAIL = f"{COLOR_RESET}\n{_BANNER_RULE}\n"
+
 # 日志系统初始化
 _logger: Optional[logging.Logger] = None
 _log_file_path: Optional[Path] = None
+_log_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def _init_logger(log_dir: Optional[Path] = None, console_only: bool = False):
@@ -91,7 +121,29 @@ def _add_file_handler(log_dir: Path):
     file_handler = logging.FileHandler(_log_file_path, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
-    _logger.addHandler(file_handler)
+    
+    # 文件写入交给后台线程：stdout 解析循环只把记录放进队列，不在热路径上做磁盘 I/O
+    global _log_listener
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_stop_log_listener)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+    _logger.addHandler(queue_handler)
+
+
+def _stop_log_listener():
+    """停止后台日志线程并写出队列中剩余的记录（退出时调用）"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
 
 
 def set_log_dir(log_dir: Path):
@@ -103,12 +155,8 @@ def set_log_dir(log_dir: Path):
         _init_logger(log_dir)
         return
     
-    # 检查是否已有文件 handler
-    has_file_handler = any(
-        isinstance(h, logging.FileHandler) for h in _logger.handlers
-    )
-    
-    if not has_file_handler:
+    # 检查是否已有文件 handler（经由队列写入，以 _log_file_path 判断）
+    if _log_file_path is None:
         _add_file_handler(log_dir)
         log_info(f"Log file: {_log_file_path}")
 
@@ -198,12 +246,17 @@ def parse_args():
     role = None
     usr_cwd_override: Optional[str] = None
     yolo = False
+    daemon = False
 
     args = sys.argv[1:]
     positional = []
     i = 0
     while i < len(args):
         arg = args[i]
+        if arg == '--daemon':
+            daemon = True
+            i += 1
+            continue
         if arg == '--yolo':
             yolo = True
             i += 1
@@ -233,6 +286,9 @@ def parse_args():
         positional.append(arg)
         i += 1
 
+    if daemon:
+        return {'mode': 'daemon'}
+
     if not positional:
         log_error('Task required')
         sys.exit(1)
@@ -269,6 +325,9 @@ def parse_args():
 def resolve_usr_cwd(path_str: str) -> Path:
     """规范化并校验 usr_cwd"""
     path = Path(path_str).expanduser()
+    # 快速路径：Orchestrator 传入的已是绝对规范路径，一次 stat 即可，跳过 resolve() 的逐级 lstat
+    if path.is_absolute() and '..' not in path.parts and os.path.isdir(path):
+        return path
     path = path if path.is_absolute() else (Path.cwd() / path)
     path = path.resolve()
     if not path.exists():
@@ -311,15 +370,21 @@ def read_piped_task() -> Optional[str]:
     - 如果 stdin 是管道（非 tty）且存在内容，返回读取到的字符串
     - 否则返回 None
     """
-    import select
-
     stdin = sys.stdin
     if stdin is None or stdin.isatty():
         log_info("Stdin is tty or None, skipping pipe read")
         return None
 
     # 使用 select 检查是否有数据可读（0 秒超时，非阻塞）
-    readable, _, _ = select.select([stdin], [], [], 0)
+    try:
+        readable, _, _ = select.select([stdin], [], [], 0)
+    except (OSError, ValueError):
+        # Windows 上 select 只支持 socket：改用 fstat，重定向的管道/文件读到 EOF 即可
+        try:
+            mode = os.fstat(stdin.fileno()).st_mode
+        except (OSError, ValueError):
+            mode = 0
+        readable = stat.S_ISFIFO(mode) or stat.S_ISREG(mode)
     if not readable:
         log_info("No data available on stdin")
         return None
@@ -344,12 +409,13 @@ def should_stream_via_stdin(task_text: str, piped: bool) -> bool:
     """
     if piped:
         return True
+    # 先做 O(1) 的长度判断，长文本无需再扫描字符
+    if len(task_text) > 800:
+        return True
     if '\n' in task_text:
         return True
     if '\\' in task_text:
         return True
-    if len(task_text) > 800:
-        return True
     return False
 
 
@@ -396,16 +462,35 @@ def build_codex_args(params: dict, target_arg: str) -> list:
     return base_args
 
 
+_codex_path: Optional[str] = None
+
+
 def find_codex_executable() -> str:
     """
-    查找 codex 可执行文件的完整路径。
+    查找 codex 可执行文件的完整路径（进程内只解析一次，daemon 模式下跨请求复用）。
+    CODEX_BINARY 环境变量可直接指定路径，跳过 PATH 查找。
     在 Windows 上，shutil.which 会自动解析 .cmd/.bat/.exe 扩展名。
     """
-    codex_path = shutil.which('codex')
-    if codex_path:
-        return codex_path
-    # 回退到直接使用 'codex'，让后续报错处理
-    return 'codex'
+    global _codex_path
+    if _codex_path is None:
+        # 回退到直接使用 'codex'，让后续报错处理
+        _codex_path = os.environ.get('CODEX_BINARY') or shutil.which('codex') or 'codex'
+    return _codex_path
+
+
+def _write_task_stdin(stdin, task_text: str):
+    """以 UTF-8 写入任务文本并关闭 stdin（在后台线程中运行）"""
+    try:
+        stdin.write(task_text.encode('utf-8'))
+        stdin.flush()
+    except (BrokenPipeError, OSError, ValueError) as exc:
+        # codex 提前退出或管道已被清理关闭；退出码由主线程处理
+        log_warn(f"Failed to write task to codex stdin: {exc}")
+    finally:
+        try:
+            stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            pass
 
 
 def _cleanup_process(process: Optional[subprocess.Popen], terminate: bool = True):
@@ -446,6 +531,37 @@ def _cleanup_process(process: Optional[subprocess.Popen], terminate: bool = True
         log_warn(f"Failed to cleanup process: {e}")
 
 
+def _first_n_lines(text: str, n: int) -> Tuple[str, int]:
+    """返回 (前 n 行, 剩余行数)；只定位第 n 个换行符后切片一次，不为大输出构建行列表"""
+    pos = -1
+    for _ in range(n):
+        pos = text.find('\n', pos + 1)
+        if pos < 0:
+            return text, 0
+    return text[:pos], text.count('\n', pos)
+
+
+def _start_watchdog(process: subprocess.Popen, timeout_sec: int):
+    """
+    整体超时：到时 kill 子进程，stdout 读取随之以 EOF 结束，
+    读取结束后由调用方检查 fired 再报告超时。返回 (timer, fired)。
+    不用 SIGALRM：信号处理函数会在主线程任意位置（日志、异常处理、清理）抛出异常。
+    """
+    fired = threading.Event()
+
+    def _expire():
+        fired.set()
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+    timer = threading.Timer(timeout_sec, _expire)
+    timer.daemon = True
+    timer.start()
+    return timer, fired
+
+
 def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec: int):
     """
     启动 codex 子进程，处理 stdin / JSON 行输出和错误，成功时返回 (last_agent_message, thread_id)。
@@ -454,6 +570,7 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
     thread_id: Optional[str] = None
     last_agent_message: Optional[str] = None
     process: Optional[subprocess.Popen] = None
+    watchdog = None
 
     # 解析 codex 完整路径（Windows 兼容）
     codex_path = find_codex_executable()
@@ -465,37 +582,40 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
         log_codex(' '.join(codex_args))
         log_debug(f"Full command args: {codex_args}")
         
-        # 完整显示实际任务内容（带颜色区分）- 输出到 stderr 以便实时显示
-        MAGENTA = '\033[35m'
-        CYAN = '\033[36m'
-        RESET = '\033[0m'
-        BOLD = '\033[1m'
-        print(f"\n{MAGENTA}{'─' * 60}{RESET}", file=sys.stderr)
-        print(f"{MAGENTA}{BOLD}📋 PROMPT TO CODEX:{RESET}", file=sys.stderr)
-        print(f"{MAGENTA}{'─' * 60}{RESET}", file=sys.stderr)
-        print(f"{CYAN}{task_text}{RESET}", file=sys.stderr)
-        print(f"{MAGENTA}{'─' * 60}{RESET}\n", file=sys.stderr, flush=True)
+        # 完整显示实际任务内容（带颜色区分）- 输出到 stderr 以便实时显示，一次写入
+        sys.stderr.write(_PROMPT_BANNER_HEAD + task_text + _PROMPT_BANNER_TAIL)
+        sys.stderr.flush()
         
         log_debug("Creating subprocess...")
         log_process_event("POPEN_START", {"args": codex_args, "use_stdin": use_stdin})
         
         process = subprocess.Popen(
             codex_args,
-            stdin=subprocess.PIPE if use_stdin else None,
+            # DEVNULL keeps codex off our stdin (the daemon request channel)
+            stdin=subprocess.PIPE if use_stdin else subprocess.DEVNULL,
             stdout=subprocess.PIPE,
             stderr=sys.stderr,
-            text=True,
-            bufsize=1,
+            # 二进制管道：codex 事件流是 UTF-8 JSON，直接按字节解析，不经过 locale 解码
+            # 64 KB 缓冲：逐行迭代时每次 read 系统调用最多取回 64 KB（管道有多少取多少，不会等满）
+            bufsize=65536,
+            # 本进程的 fd 默认不可继承 (PEP 446)，无需 fd 扫描
+            close_fds=False,
         )
         
         log_info(f"Process started with PID: {process.pid}")
         log_process_event("POPEN_SUCCESS", {"pid": process.pid})
 
-        # 如果使用 stdin 模式，写入任务到 stdin 并关闭
+        # 超时覆盖整个读取过程，而不只是最后的 wait
+        watchdog = _start_watchdog(process, timeout_sec)
+
+        # 如果使用 stdin 模式，在后台线程写入任务并关闭 stdin；
+        # 主线程立即开始读 stdout，避免大任务写满管道而 codex 同时阻塞在输出上造成死锁
+        writer = None
         if use_stdin and process.stdin is not None:
-            process.stdin.write(task_text)
-            process.stdin.flush()  # 强制刷新缓冲区，避免大任务死锁
-            process.stdin.close()
+            writer = threading.Thread(
+                target=_write_task_stdin, args=(process.stdin, task_text), daemon=True
+            )
+            writer.start()
 
         # 逐行解析 JSON 输出
         if process.stdout is None:
@@ -504,6 +624,9 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
 
         log_info("Reading stdout...")
         verbose = os.environ.get('CODEX_VERBOSE', '').lower() in ('1', 'true', 'yes')
+        # 逐事件的 "Event:" 行默认只写日志文件（DEBUG），结束时在控制台输出一次计数汇总
+        log_event = log_info if verbose else log_debug
+        event_counts = {}
 
         for line in process.stdout:
             line = line.strip()
@@ -512,24 +635,32 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
 
             # 详细模式：打印原始JSON（截断）
             if verbose:
-                display = line[:500] + '...' if len(line) > 500 else line
+                raw = line.decode('utf-8', 'replace')
+                display = raw[:500] + '...' if len(raw) > 500 else raw
                 log_info(f"RAW: {display}")
+            elif line[:1] == b'{' and not any(marker in line for marker in _CONSUMED_EVENT_MARKERS):
+                # 非详细模式下跳过不消费的事件类型（如 turn.*、delta），免去整行 JSON 解析
+                event_counts['other'] = event_counts.get('other', 0) + 1
+                continue
 
             try:
-                event = json.loads(line)
+                event = _json_loads(line)
                 event_type = event.get('type', 'unknown')
                 item = event.get('item', {})
                 item_type = item.get('type', '')
 
+                event_key = f"{event_type}:{item_type}" if item_type else event_type
+                event_counts[event_key] = event_counts.get(event_key, 0) + 1
+
                 # 详细打印事件内容
                 if event_type == 'thread.started':
-                    log_info(f"Event: {event_type}")
+                    log_event(f"Event: {event_type}")
                 
                 elif event_type == 'item.started':
-                    log_info(f"Event: {event_type} ({item_type})")
+                    log_event(f"Event: {event_type} ({item_type})")
                 
                 elif event_type == 'item.completed':
-                    log_info(f"Event: {event_type} ({item_type})")
+                    log_event(f"Event: {event_type} ({item_type})")
                     
                     # 打印命令执行详情
                     if item_type == 'command_execution':
@@ -545,11 +676,8 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
                             log_info(f"  EXIT: {exit_code}")
                         if output:
                             # 显示输出（截断过长内容）
-                            output_lines = output.strip().split('\n')
-                            if len(output_lines) > 10:
-                                output_display = '\n'.join(output_lines[:10]) + f'\n... ({len(output_lines)-10} more lines)'
-                            else:
-                                output_display = output.strip()
+                            head, more = _first_n_lines(output.strip(), 10)
+                            output_display = head + f'\n... ({more} more lines)' if more else head
                             if len(output_display) > 500:
                                 output_display = output_display[:500] + '...'
                             log_info(f"  OUTPUT:\n{output_display}")
@@ -597,11 +725,20 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
                     if text:
                         last_agent_message = text
 
-            except json.JSONDecodeError:
-                log_warn(f"Failed to parse line: {line}")
+            except json.JSONDecodeError:  # orjson.JSONDecodeError 是其子类
+                log_warn(f"Failed to parse line: {line.decode('utf-8', 'replace')}")
+
+        if writer is not None:
+            writer.join()
 
-        # 等待进程结束并检查退出码
-        returncode = process.wait(timeout=timeout_sec)
+        if event_counts:
+            log_info("Events: " + ", ".join(f"{k}={v}" for k, v in event_counts.items()))
+
+        # 等待进程结束并检查退出码（watchdog 已兜底超时，直接阻塞等待）
+        returncode = process.wait()
+        watchdog[0].cancel()
+        if watchdog[1].is_set():
+            raise subprocess.TimeoutExpired('codex', timeout_sec)
         
         # 释放管道句柄（进程已结束，不需要terminate）
         _cleanup_process(process, terminate=False)
@@ -660,10 +797,19 @@ def run_codex_process(codex_args, task_text: str, use_stdin: bool, timeout_sec:
         _cleanup_process(process)
         sys.exit(1)
 
+    finally:
+        if watchdog is not None:
+            watchdog[0].cancel()
 
-def main():
-    log_info("Script started")
-    params = parse_args()
+
+def execute_task(params: dict, allow_piped: bool = True) -> Tuple[str, Optional[str]]:
+    """
+    执行单个 codex 任务（CLI 与 daemon 模式共用）。
+
+    失败路径沿用 sys.exit，daemon 模式下由调用方捕获 SystemExit。
+    Returns:
+        (last_agent_message, thread_id)
+    """
     usr_cwd_path = resolve_usr_cwd(params.get('usr_cwd', DEFAULT_WORKDIR))
     params['usr_cwd'] = str(usr_cwd_path)
     
@@ -679,7 +825,7 @@ def main():
 
     apply_role_file(params.get('role'), usr_cwd_path)
 
-    piped_task = read_piped_task()
+    piped_task = read_piped_task() if allow_piped else None
     piped = piped_task is not None
     task_text = piped_task if piped else params['task']
 
@@ -716,19 +862,95 @@ def main():
 
     log_info(f"codex running in {params['usr_cwd']} (mode={params['mode']})...")
 
-    last_agent_message, thread_id = run_codex_process(
+    return run_codex_process(
         codex_args=codex_args,
         task_text=task_text,
         use_stdin=use_stdin,
         timeout_sec=timeout_sec,
     )
 
-    # 输出 agent_message
-    sys.stdout.write(f"{last_agent_message}\n")
 
-    # 输出 session_id（如果存在）
+def format_result(last_agent_message: str, thread_id: Optional[str]) -> str:
+    """拼装输出文本：agent_message + 可选的 SESSION_ID 尾部"""
+    result = f"{last_agent_message}\n"
     if thread_id:
-        sys.stdout.write(f"\n---\nSESSION_ID: {thread_id}\n")
+        result += f"\n---\nSESSION_ID: {thread_id}\n"
+    return result
+
+
+def handle_daemon_request(request: dict) -> dict:
+    """
+    处理一条 daemon 请求 {role, usr_cwd, task, yolo[, session_id]}，
+    返回 {status, output, session_id}。
+    """
+    params = {
+        'mode': 'resume' if request.get('session_id') else 'new',
+        'session_id': request.get('session_id'),
+        'task': request.get('task') or '',
+        'usr_cwd': request.get('usr_cwd') or DEFAULT_WORKDIR,
+        'instructions': request.get('instructions'),
+        'role': request.get('role'),
+        'yolo': bool(request.get('yolo')),
+    }
+    if not params['task']:
+        log_error('Task required')
+        return {'status': 1, 'output': '', 'session_id': None}
+
+    try:
+        last_agent_message, thread_id = execute_task(params, allow_piped=False)
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else 1
+        return {'status': status or 1, 'output': '', 'session_id': None}
+
+    return {
+        'status': 0,
+        'output': format_result(last_agent_message, thread_id),
+        'session_id': thread_id,
+    }
+
+
+def serve_daemon():
+    """
+    Daemon 模式：从 stdin 逐行读取 JSON 请求，每个响应写一行 JSON 后跟
+    DAEMON_END_MARKER 行。解释器启动开销每个 worker 只付一次。
+    收到 {"cmd": "shutdown"} 或 stdin EOF 时退出。
+    """
+    log_info("Daemon mode: waiting for requests on stdin")
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                log_error(f"Invalid daemon request: {e}")
+                response = {'status': 2, 'output': '', 'session_id': None}
+            else:
+                if request.get('cmd') == 'shutdown':
+                    log_info("Daemon shutdown requested")
+                    break
+                response = handle_daemon_request(request)
+            sys.stdout.write(f"{json.dumps(response)}\n{DAEMON_END_MARKER}\n")
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        log_error("Daemon interrupted by user")
+        sys.exit(130)
+    log_info("Daemon exiting")
+
+
+def main():
+    log_info("Script started")
+    params = parse_args()
+
+    if params['mode'] == 'daemon':
+        serve_daemon()
+        sys.exit(0)
+
+    last_agent_message, thread_id = execute_task(params)
+
+    # 输出 agent_message 及 session_id（如果存在）
+    sys.stdout.write(format_result(last_agent_message, thread_id))
 
     sys.exit(0)
 
@@ -3,10 +3,12 @@
 Git operations module for Orchestrator.
 Provides atomic, testable git functions with proper error handling.
 """
+import functools
+import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 
 class GitError(Exception):
@@ -17,6 +19,23 @@ class GitError(Exception):
         self.stderr = stderr
 
 
+_git_bin: Optional[str] = None
+
+
+def set_git_binary(path: Optional[str]) -> None:
+    """Override the git executable (None re-resolves from PATH on next use)."""
+    global _git_bin
+    _git_bin = path
+
+
+def _resolve_git() -> str:
+    """Resolve git through PATH once and reuse the absolute path."""
+    global _git_bin
+    if _git_bin is None:
+        _git_bin = shutil.which("git") or "git"
+    return _git_bin
+
+
 def _find_git_root(cwd: Path) -> Optional[Path]:
     """Find the .git directory root."""
     current = cwd.resolve()
@@ -47,24 +66,44 @@ def _clear_index_lock(cwd: Path) -> bool:
     return False
 
 
-def _run_git(args: list, cwd: Path, check: bool = True, retry_on_lock: bool = True) -> Tuple[int, str, str]:
+def _run_git(
+    args: list,
+    cwd: Path,
+    check: bool = True,
+    retry_on_lock: bool = True,
+    input_data: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> Tuple[int, str, str]:
     """
     Execute a git command.
     
     If retry_on_lock is True and the command fails due to index.lock,
     automatically remove the lock file and retry once.
+    input_data, if given, is fed to the command's stdin.
+    
+    Output is decoded in the locale encoding unless `encoding` is given;
+    an explicit encoding uses errors="surrogateescape", so raw paths read
+    from git can be fed back to it byte-exact.
+    
+    The working tree is passed as `git -C` rather than Popen's cwd, and fds
+    are not swept, so CPython can launch git with posix_spawn instead of
+    fork + exec.
     
     Returns:
         (returncode, stdout, stderr)
     """
-    cmd = ["git"] + args
+    cmd = [_resolve_git(), "-C", str(cwd)] + args
+    errors = "surrogateescape" if encoding else None
     try:
         result = subprocess.run(
             cmd,
-            cwd=str(cwd),
+            input=input_data,
             capture_output=True,
             text=True,
-            timeout=60
+            encoding=encoding,
+            errors=errors,
+            timeout=60,
+            close_fds=False
         )
         
         # Check for index.lock error and retry
@@ -74,10 +113,13 @@ def _run_git(args: list, cwd: Path, check: bool = True, retry_on_lock: bool = Tr
                     # Retry once after clearing lock
                     result = subprocess.run(
                         cmd,
-                        cwd=str(cwd),
+                        input=input_data,
                         capture_output=True,
                         text=True,
-                        timeout=60
+                        encoding=encoding,
+                        errors=errors,
+                        timeout=60,
+                        close_fds=False
                     )
         
         return result.returncode, result.stdout.strip(), result.stderr.strip()
@@ -87,8 +129,14 @@ def _run_git(args: list, cwd: Path, check: bool = True, retry_on_lock: bool = Tr
         raise GitError("git not found in PATH", returncode=127)
 
 
+@functools.lru_cache(maxsize=8)
 def get_current_branch(cwd: Path) -> str:
-    """Get the current branch name."""
+    """
+    Get the current branch name.
+    
+    Memoized per cwd for the run; create_branch clears the cache. Call
+    get_current_branch.cache_clear() after switching branches externally.
+    """
     code, out, err = _run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd)
     if code != 0:
         raise GitError(f"Failed to get current branch: {err}", code, err)
@@ -109,10 +157,19 @@ def create_branch(cwd: Path, branch_name: str, base_branch: Optional[str] = None
     Returns:
         The actual branch name created.
     """
-    # Find unique branch name
+    # Find unique branch name; one for-each-ref lists every taken candidate
+    # instead of probing name, name-1, name-2, ... with a git call each
+    code, out, err = _run_git(
+        ["for-each-ref", "--format=%(refname)",
+         f"refs/heads/{branch_name}", f"refs/heads/{branch_name}-*"],
+        cwd
+    )
+    if code != 0:
+        raise GitError(f"Failed to list branches: {err}", code, err)
+    taken = {ref[len("refs/heads/"):] for ref in out.splitlines()}
     actual_name = branch_name
     suffix = 1
-    while branch_exists(cwd, actual_name):
+    while actual_name in taken:
         actual_name = f"{branch_name}-{suffix}"
         suffix += 1
     
@@ -122,52 +179,110 @@ def create_branch(cwd: Path, branch_name: str, base_branch: Optional[str] = None
     else:
         code, out, err = _run_git(["checkout", "-b", actual_name], cwd)
     
+    get_current_branch.cache_clear()
     if code != 0:
         raise GitError(f"Failed to create branch '{actual_name}': {err}", code, err)
     
     return actual_name
 
 
-def stage_all(cwd: Path) -> None:
-    """Stage all changes (git add -A)."""
-    code, out, err = _run_git(["add", "-A"], cwd)
+def _status_v2(cwd: Path) -> Tuple[Optional[str], List[str]]:
+    """
+    Run one `git status --porcelain=v2 -z --branch -uall`.
+    
+    Untracked directories are expanded to their files. Rename/copy entries
+    are already recorded in the index, so only their new path is returned
+    (the original path is skipped).
+    
+    Returns:
+        (HEAD commit id or None on an unborn branch, changed paths)
+    """
+    code, out, err = _run_git(
+        ["status", "--porcelain=v2", "-z", "--branch", "-uall"],
+        cwd,
+        encoding="utf-8"
+    )
     if code != 0:
-        raise GitError(f"Failed to stage changes: {err}", code, err)
+        raise GitError(f"Failed to check status: {err}", code, err)
+    
+    head = None
+    paths = []
+    entries = out.split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        kind = entry[:1]
+        if kind == "1":
+            paths.append(entry.split(" ", 8)[8])
+        elif kind == "2":
+            paths.append(entry.split(" ", 9)[9])
+            i += 1  # skip origPath
+        elif kind == "u":
+            paths.append(entry.split(" ", 10)[10])
+        elif kind == "?":
+            paths.append(entry[2:])
+        elif entry.startswith("# branch.oid "):
+            oid = entry[len("# branch.oid "):]
+            head = None if oid == "(initial)" else oid
+    return head, paths
 
 
-def commit(cwd: Path, message: str, allow_empty: bool = False) -> Optional[str]:
+def commit_paths(cwd: Path, paths: List[str], message: str, head: Optional[str]) -> str:
     """
-    Commit staged changes.
+    Record `paths` in the index and commit them on top of `head` using
+    plumbing only: update-index --stdin, write-tree, commit-tree, update-ref.
+    
+    No hooks run. update-ref is given `head` as the expected old value, so
+    a concurrent commit makes this fail instead of being overwritten.
     
     Returns:
-        Commit hash, or None if nothing to commit (when allow_empty=False).
+        The new commit hash.
     """
-    args = ["commit", "-m", message]
-    if allow_empty:
-        args.append("--allow-empty")
+    code, out, err = _run_git(
+        ["update-index", "--add", "--remove", "-z", "--stdin"],
+        cwd,
+        input_data="\0".join(paths) + "\0",
+        encoding="utf-8"
+    )
+    if code != 0:
+        raise GitError(f"Failed to stage changes: {err}", code, err)
     
-    code, out, err = _run_git(args, cwd)
+    code, tree, err = _run_git(["write-tree"], cwd)
+    if code != 0:
+        raise GitError(f"Failed to write tree: {err}", code, err)
     
-    # Nothing to commit is not an error
+    args = ["commit-tree", tree, "-m", message]
+    if head:
+        args += ["-p", head]
+    code, commit_hash, err = _run_git(args, cwd)
     if code != 0:
-        if "nothing to commit" in err or "nothing to commit" in out:
-            return None
         raise GitError(f"Failed to commit: {err}", code, err)
     
-    # Get the commit hash
-    code, hash_out, _ = _run_git(["rev-parse", "HEAD"], cwd)
-    return hash_out if code == 0 else None
+    subject = message.split("\n", 1)[0]
+    reflog = f"commit: {subject}" if head else f"commit (initial): {subject}"
+    code, out, err = _run_git(["update-ref", "-m", reflog, "HEAD", commit_hash, head or ""], cwd)
+    if code != 0:
+        raise GitError(f"Failed to update HEAD: {err}", code, err)
+    
+    return commit_hash
 
 
 def stage_and_commit(cwd: Path, message: str) -> Optional[str]:
     """
-    Stage all and commit.
+    Stage all changes and commit.
+    
+    One status call collects the changed paths and HEAD; a clean tree
+    skips the commit entirely. Otherwise the paths are committed through
+    plumbing (see commit_paths).
     
     Returns:
         Commit hash, or None if nothing to commit.
     """
-    stage_all(cwd)
-    return commit(cwd, message)
+    head, paths = _status_v2(cwd)
+    if not paths:
+        return None
+    return commit_paths(cwd, paths, message, head)
 
 
 def is_git_repo(cwd: Path) -> bool: